@@ -5,15 +5,41 @@ import os
 import hashlib
 import shutil
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Tuple
-from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional, Any, Tuple, Union
+from dataclasses import dataclass, fields
 from enum import Enum
+from functools import lru_cache
+from operator import attrgetter
 import logging
 import time
 import re
 
+from .process import MAX_OUTPUT_CHARS, new_log_path, run_streaming
+
 logger = logging.getLogger(__name__)
 
+# Skipped when searching for sources: forge output/caches and run logs only at the
+# project root (a src/cache/ or lib/x/src/out/ may hold real sources), VCS and
+# package metadata at any depth
+SOURCE_WALK_ROOT_IGNORED_DIRS = frozenset({"out", "cache", "broadcast", ".build_cache", ".logs"})
+SOURCE_WALK_IGNORED_DIRS = frozenset({".git", "node_modules"})
+
+# Compilation results older than this are recompiled
+CACHE_TTL_SECONDS = 86400
+
+
+@lru_cache(maxsize=None)
+def _field_getter(cls: type) -> Tuple[Tuple[str, ...], attrgetter]:
+    """Field names of a dataclass and a getter returning their values as a tuple"""
+    names = tuple(f.name for f in fields(cls))
+    return names, attrgetter(*names)
+
+
+def _shallow_asdict(record: Any) -> Dict[str, Any]:
+    """Field dict of a dataclass without asdict()'s recursive deep copy"""
+    names, getter = _field_getter(type(record))
+    return dict(zip(names, getter(record)))
+
 
 class BuildToolchain(Enum):
     """Supported build toolchains"""
@@ -21,7 +47,7 @@ class BuildToolchain(Enum):
     UNKNOWN = "unknown"
 
 
-@dataclass
+@dataclass(frozen=True)
 class BuildConfig:
     """Build configuration"""
     toolchain: BuildToolchain
@@ -34,12 +60,12 @@ class BuildConfig:
     evm_version: str = "london"
     
     def to_dict(self) -> Dict[str, Any]:
-        result = asdict(self)
+        result = _shallow_asdict(self)
         result['toolchain'] = self.toolchain.value
         return result
 
 
-@dataclass
+@dataclass(slots=True)
 class CompilationResult:
     """Compilation result"""
     success: bool
@@ -52,10 +78,10 @@ class CompilationResult:
     coverage: Optional[Dict[str, Any]] = None
     
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        return _shallow_asdict(self)
 
 
-@dataclass
+@dataclass(slots=True)
 class ScriptRunResult:
     """Result of running a Foundry script"""
     success: bool
@@ -68,10 +94,10 @@ class ScriptRunResult:
     script_target: str
     
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        return _shallow_asdict(self)
 
 
-@dataclass
+@dataclass(slots=True)
 class TestResult:
     """Result of running tests"""
     success: bool
@@ -79,9 +105,10 @@ class TestResult:
     stdout: str
     stderr: str
     duration: float
+    log_file: Optional[str] = None
     
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        return _shallow_asdict(self)
 
 
 @dataclass
@@ -101,6 +128,8 @@ class BuildManager:
         self.project_root = Path(project_root).resolve()
         self.cache_dir = self.project_root / ".build_cache"
         self.cache_dir.mkdir(exist_ok=True)
+        # Last successful compile kept in memory: (cache_key, timestamp, result)
+        self._last_compile: Optional[Tuple[str, float, CompilationResult]] = None
         
         self.toolchain_patterns = {
             BuildToolchain.FOUNDRY: [
@@ -196,20 +225,25 @@ class BuildManager:
                 cwd=self.project_root
             )
             if result.returncode == 0:
-                versions = result.stdout.strip().split('\n')
-                return [v.strip() for v in versions if v.strip()]
+                return [v.strip() for v in result.stdout.splitlines() if v.strip()]
         except Exception as e:
             logger.error(f"Error getting solc versions: {e}")
         return []
     
     def _calculate_source_hash(self, source_files: List[Path]) -> str:
-        """Calculate hash of source files for caching"""
-        hasher = hashlib.sha256()
+        """Fingerprint source files for caching.
+        
+        Hashes (path, mtime_ns, size) from a single stat per file instead of
+        reading every source, which matters once lib/ holds large dependencies.
+        """
+        hasher = hashlib.blake2b(digest_size=16)
         
         for file_path in sorted(source_files):
-            if file_path.exists():
-                hasher.update(str(file_path).encode())
-                hasher.update(file_path.read_bytes())
+            try:
+                st = file_path.stat()
+            except FileNotFoundError:
+                continue
+            hasher.update(f"{file_path}\0{st.st_mtime_ns}\0{st.st_size}\n".encode())
         
         return hasher.hexdigest()
     
@@ -230,7 +264,7 @@ class BuildManager:
             with open(cache_file, 'r') as f:
                 cache_data = json.load(f)
             
-            if time.time() - cache_data['timestamp'] > 86400:
+            if time.time() - cache_data['timestamp'] > CACHE_TTL_SECONDS:
                 logger.info("Cache expired, removing")
                 cache_file.unlink()
                 return None
@@ -249,6 +283,7 @@ class BuildManager:
         broadcast: bool = True,
         transaction_type: str = "1559",
         extra_args: Optional[List[str]] = None,
+        timeout: int = 300,
     ) -> ScriptRunResult:
         """
         Run a Foundry script using `forge script`.
@@ -260,6 +295,7 @@ class BuildManager:
             broadcast: Whether to add `--broadcast`
             transaction_type: "legacy" or "1559"
             extra_args: Extra CLI args to append (e.g. ["--verify", ...])
+            timeout: Seconds before the script is killed (default: 300)
         """
         start_time = time.time()
         
@@ -314,20 +350,28 @@ class BuildManager:
         try:
             logger.info(f"Running script: {' '.join(cmd[:10])}... (truncated)")
             
-            result = subprocess.run(
-                cmd,
-                cwd=self.project_root,
-                capture_output=True,
-                text=True,
-                timeout=300,
+            result = run_streaming(
+                cmd, cwd=self.project_root, timeout=timeout, max_chars=MAX_OUTPUT_CHARS
             )
             
+            if result.timed_out:
+                return ScriptRunResult(
+                    success=False,
+                    return_code=124,
+                    stdout=result.stdout,
+                    stderr=f"Script timeout (exceeded {timeout} seconds)",
+                    rpc_url=rpc_url,
+                    broadcast=broadcast,
+                    transaction_type=transaction_type,
+                    script_target=script_target_with_contract,
+                )
+            
             duration = time.time() - start_time
-            logger.info(f"Script finished with code {result.returncode} in {duration:.2f}s")
+            logger.info(f"Script finished with code {result.return_code} in {duration:.2f}s")
             
             return ScriptRunResult(
-                success=result.returncode == 0,
-                return_code=result.returncode,
+                success=result.return_code == 0,
+                return_code=result.return_code,
                 stdout=result.stdout,
                 stderr=result.stderr,
                 rpc_url=rpc_url,
@@ -336,18 +380,6 @@ class BuildManager:
                 script_target=script_target_with_contract,
             )
         
-        except subprocess.TimeoutExpired:
-            return ScriptRunResult(
-                success=False,
-                return_code=124,
-                stdout="",
-                stderr="Script timeout (exceeded 5 minutes)",
-                rpc_url=rpc_url,
-                broadcast=broadcast,
-                transaction_type=transaction_type,
-                script_target=script_target_with_contract,
-            )
-        
         except Exception as e:
             return ScriptRunResult(
                 success=False,
@@ -385,12 +417,17 @@ class BuildManager:
         """Find source files based on toolchain (Foundry only)"""
         source_files = []
         
-        for sol_file in self.project_root.rglob("*.sol"):
-            relative_path = str(sol_file.relative_to(self.project_root))
-            if "out/" not in relative_path:
-                source_files.append(sol_file)
-        
-        source_files = sorted(source_files)
+        # Prune build output, caches and VCS metadata before descending instead of
+        # walking them and filtering afterwards: out/ alone can hold thousands of files
+        root_ignored = SOURCE_WALK_ROOT_IGNORED_DIRS | SOURCE_WALK_IGNORED_DIRS
+        for dirpath, dirnames, filenames in os.walk(self.project_root):
+            ignored = root_ignored if dirpath == str(self.project_root) else SOURCE_WALK_IGNORED_DIRS
+            dirnames[:] = [d for d in dirnames if d not in ignored]
+            for filename in filenames:
+                if filename.endswith(".sol"):
+                    source_files.append(Path(dirpath, filename))
+        
+        source_files.sort()
         logger.info(f"Found {len(source_files)} source files")
         
         return source_files
@@ -426,16 +463,15 @@ class BuildManager:
         start_time = time.time()
         
         try:
-            result = subprocess.run(
+            result = run_streaming(
                 ["forge", "build"],
-                capture_output=True,
-                text=True,
-                cwd=self.project_root
+                cwd=self.project_root,
+                max_chars=MAX_OUTPUT_CHARS,
             )
             
             compilation_time = time.time() - start_time
             
-            if result.returncode != 0:
+            if result.return_code != 0:
                 return CompilationResult(
                     success=False,
                     artifacts=[],
@@ -476,7 +512,7 @@ class BuildManager:
         if not out_dir.exists():
             return artifacts
         
-        for artifact_file in out_dir.rglob("*.json"):
+        for artifact_file in self._iter_artifact_files(out_dir):
             try:
                 with open(artifact_file, 'r') as f:
                     artifact_data = json.load(f)
@@ -499,6 +535,18 @@ class BuildManager:
         
         return artifacts
     
+    def _iter_artifact_files(self, out_dir: Path):
+        """Yield contract artifact JSON files under out/, skipping build-info/.
+        
+        build-info/ holds the full solc input/output of each build; it is by far
+        the largest JSON in out/ and never contains a contract artifact.
+        """
+        for dirpath, dirnames, filenames in os.walk(out_dir):
+            dirnames[:] = [d for d in dirnames if d != "build-info"]
+            for filename in filenames:
+                if filename.endswith(".json"):
+                    yield Path(dirpath) / filename
+    
     def _extract_contract_name(self, artifact_file: Path, artifact_data: Dict[str, Any]) -> str:
         """Extract contract name from Foundry artifact"""
         if 'contractName' in artifact_data:
@@ -533,8 +581,25 @@ class BuildManager:
         return artifact_file.stem if artifact_file.stem else 'Unknown'
     
     
-    def compile(self, config: Optional[BuildConfig] = None) -> CompilationResult:
-        """Main compilation method with caching"""
+    def source_fingerprint(self, config: BuildConfig) -> Tuple[List[Path], str]:
+        """Source files for config and the cache key a compile of them would use"""
+        source_files = self.find_source_files(config.toolchain)
+        return source_files, self._get_cache_key(config, source_files)
+    
+    def compile(
+        self,
+        config: Optional[BuildConfig] = None,
+        source_files: Optional[List[Path]] = None,
+        cache_key: Optional[str] = None
+    ) -> CompilationResult:
+        """Main compilation method with caching
+        
+        Args:
+            config: Build configuration (detected from the project if not provided)
+            source_files: Sources already found by `source_fingerprint`, to skip a second walk
+            cache_key: Key returned with source_files by `source_fingerprint`, to skip
+                re-statting every source (only used together with source_files)
+        """
         if config is None:
             toolchain = self.detect_toolchain()
             solc_version = self.get_solc_version() or "0.8.19"
@@ -546,7 +611,9 @@ class BuildManager:
                 output_dir="out" if toolchain == BuildToolchain.FOUNDRY else "artifacts"
             )
         
-        source_files = self.find_source_files(config.toolchain)
+        if source_files is None:
+            source_files = self.find_source_files(config.toolchain)
+            cache_key = None
         
         if not source_files:
             return CompilationResult(
@@ -558,7 +625,15 @@ class BuildManager:
                 warnings=[]
             )
         
-        cache_key = self._get_cache_key(config, source_files)
+        if cache_key is None:
+            cache_key = self._get_cache_key(config, source_files)
+        
+        # Unchanged sources and config since the last compile: skip re-reading the JSON cache file
+        last = self._last_compile
+        if last is not None and last[0] == cache_key and time.time() - last[1] <= CACHE_TTL_SECONDS:
+            logger.info("Using in-memory compilation result")
+            return last[2]
+        
         cached_result = self._load_from_cache(cache_key)
         if cached_result:
             return cached_result
@@ -577,6 +652,8 @@ class BuildManager:
         
         if result.success:
             self._save_to_cache(cache_key, result, config)
+            if config.cache_enabled:
+                self._last_compile = (cache_key, time.time(), result)
         
         return result
     
@@ -585,6 +662,7 @@ class BuildManager:
         if self.cache_dir.exists():
             shutil.rmtree(self.cache_dir)
             self.cache_dir.mkdir()
+            self._last_compile = None
             logger.info("Build cache cleaned")
     
     def get_cache_stats(self) -> Dict[str, Any]:
@@ -603,9 +681,11 @@ class BuildManager:
     
     def run_tests(
         self,
-        pattern: Optional[str] = None,
+        pattern: Optional[Union[str, List[str]]] = None,
         toolchain: Optional[BuildToolchain] = None,
-        extra_args: Optional[List[str]] = None
+        extra_args: Optional[List[str]] = None,
+        max_chars: int = MAX_OUTPUT_CHARS,
+        save_log: bool = False
     ) -> TestResult:
         """
         Run tests for the project.
@@ -613,12 +693,16 @@ class BuildManager:
         For Foundry:
         - uses `forge test`
         - optional `pattern` passed as `-m pattern` (to filter by test name)
+        - a list of patterns is joined into one `-m (p1|p2|...)` regex so several
+          test groups share a single forge invocation instead of paying startup per group
         - optional `extra_args` for additional flags (e.g., ["--ffi", "-vvv", "--match-path", "test/MyTest.t.sol"])
         
         Args:
-            pattern: Test name pattern to filter (passed as `-m pattern`)
+            pattern: Test name pattern, or list of patterns, to filter (passed as `-m pattern`)
             toolchain: Build toolchain (auto-detected if not provided)
             extra_args: Extra CLI args to append (e.g., ["--ffi", "-vvv", "--match-contract", "MyTest"])
+            max_chars: Per-stream output budget; longer output keeps its head and tail
+            save_log: Also write the complete output to a file under .logs/ (path in TestResult.log_file)
         """
         start_time = time.time()
         
@@ -637,6 +721,9 @@ class BuildManager:
         
         cmd = ["forge", "test"]
         
+        if isinstance(pattern, list):
+            pattern = "|".join(f"({p})" for p in pattern if p) or None
+        
         if pattern:
             cmd.extend(["-m", pattern])
         
@@ -646,32 +733,34 @@ class BuildManager:
         try:
             logger.info(f"Running tests: {' '.join(cmd)}")
             
-            result = subprocess.run(
+            log_file = new_log_path("forge-test") if save_log else None
+            result = run_streaming(
                 cmd,
                 cwd=self.project_root,
-                capture_output=True,
-                text=True,
                 timeout=300,
+                max_chars=max_chars,
+                log_path=self.project_root / log_file if log_file else None,
             )
             
             duration = time.time() - start_time
             
+            if result.timed_out:
+                return TestResult(
+                    success=False,
+                    return_code=124,
+                    stdout=result.stdout,
+                    stderr="Tests timeout (exceeded 5 minutes)",
+                    duration=duration,
+                    log_file=log_file,
+                )
+            
             return TestResult(
-                success=result.returncode == 0,
-                return_code=result.returncode,
+                success=result.return_code == 0,
+                return_code=result.return_code,
                 stdout=result.stdout,
                 stderr=result.stderr,
                 duration=duration,
-            )
-        
-        except subprocess.TimeoutExpired:
-            duration = time.time() - start_time
-            return TestResult(
-                success=False,
-                return_code=124,
-                stdout="",
-                stderr="Tests timeout (exceeded 5 minutes)",
-                duration=duration,
+                log_file=log_file,
             )
         
         except Exception as e:
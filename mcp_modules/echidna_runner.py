@@ -1,10 +1,44 @@
+import os
+import shutil
 import subprocess
 import logging
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List
+
+from .process import MAX_OUTPUT_CHARS, new_log_path, run_streaming
 
 logger = logging.getLogger(__name__)
 
+PATH_EXTENSIONS = (".sol", ".yaml", ".yml", ".json")
+
+
+@lru_cache(maxsize=8)
+def _echidna_version(echidna_path: str, mtime_ns: int) -> str:
+    """Run `echidna --version` once per binary (path + mtime).
+    
+    Failures raise instead of returning a value: lru_cache does not cache
+    exceptions, so a failed probe (e.g. a timeout on a loaded host) is retried
+    on the next check instead of being remembered.
+    
+    Raises:
+        OSError, subprocess.TimeoutExpired: If echidna cannot be run
+        RuntimeError: If echidna exits with a non-zero status
+    """
+    result = subprocess.run(
+        [echidna_path, "--version"],
+        capture_output=True,
+        text=True,
+        timeout=10,
+    )
+    
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip() or f"exit code {result.returncode}")
+    
+    version = result.stdout.strip()
+    logger.info(f"Echidna detected: {version}")
+    return version
+
 
 class SecurityError(Exception):
     """Custom exception for security violations"""
@@ -22,31 +56,31 @@ class EchidnaRunner:
 
     def __init__(self, project_root: str):
         self.project_root = Path(project_root).resolve()
-        self._echidna_checked: Optional[bool] = None
 
     def check_echidna_installed(self) -> bool:
-        """Check if echidna is available in PATH."""
-        if self._echidna_checked is not None:
-            return self._echidna_checked
-
+        """Check if echidna is available in PATH.
+        
+        The `--version` probe is only re-run when the binary found in PATH
+        changes (different path or modification time).
+        """
+        echidna_path = shutil.which("echidna")
+        if echidna_path is None:
+            logger.error("Echidna availability check failed: echidna not found in PATH")
+            return False
+        
         try:
-            result = subprocess.run(
-                ["echidna", "--version"],
-                capture_output=True,
-                text=True,
-                timeout=10,
-            )
-            if result.returncode == 0:
-                logger.info(f"Echidna detected: {result.stdout.strip()}")
-                self._echidna_checked = True
-            else:
-                logger.error(f"Echidna check failed: {result.stderr}")
-                self._echidna_checked = False
-        except (FileNotFoundError, subprocess.TimeoutExpired) as e:
+            mtime_ns = os.stat(echidna_path).st_mtime_ns
+        except OSError as e:
             logger.error(f"Echidna availability check failed: {e}")
-            self._echidna_checked = False
-
-        return self._echidna_checked
+            return False
+        
+        try:
+            _echidna_version(echidna_path, mtime_ns)
+        except (OSError, subprocess.TimeoutExpired, RuntimeError) as e:
+            logger.error(f"Echidna availability check failed: {e}")
+            return False
+        
+        return True
 
     def _looks_like_path(self, arg: str) -> bool:
         """Check if argument looks like a file or directory path.
@@ -61,9 +95,7 @@ class EchidnaRunner:
             return True
         if "/" in arg or "\\" in arg:
             return True
-        if any(arg.endswith(ext) for ext in (".sol", ".yaml", ".yml", ".json")):
-            return True
-        return False
+        return arg.endswith(PATH_EXTENSIONS)
 
     def validate_path(self, requested_path: str) -> Path:
         """Validate and resolve file path relative to project root.
@@ -98,20 +130,26 @@ class EchidnaRunner:
     def run(
         self,
         command: List[str],
-        timeout: int = 300
+        timeout: int = 300,
+        max_chars: int = MAX_OUTPUT_CHARS,
+        save_log: bool = False
     ) -> Dict[str, Any]:
         """Run echidna command and return stdout/stderr.
         
         Args:
             command: List of command arguments (e.g., ["echidna", "test/MyTest.sol", "--config", "echidna.yaml"])
             timeout: Command timeout in seconds (default: 300)
+            max_chars: Per-stream output budget; longer output keeps its head and tail
+            save_log: Also write the complete output to a file under .logs/
             
         Returns:
             Dict with:
                 - success: bool (True if return_code == 0)
                 - return_code: int
-                - stdout: str
+                - stdout: str (head and tail only past MAX_OUTPUT_CHARS)
                 - stderr: str
+                - truncated: bool
+                - log_file: str (project-relative, only with save_log)
         """
         if not self.check_echidna_installed():
             return {
@@ -151,30 +189,37 @@ class EchidnaRunner:
         
         try:
             logger.info(f"Running Echidna: {' '.join(validated_command)}")
+            
+            log_file = new_log_path("echidna") if save_log else None
 
-            result = subprocess.run(
+            result = run_streaming(
                 validated_command,
                 cwd=self.project_root,
-                capture_output=True,
-                text=True,
                 timeout=timeout,
+                max_chars=max_chars,
+                log_path=self.project_root / log_file if log_file else None,
             )
             
+            if result.timed_out:
+                # Keep what the campaign printed before it was killed
+                return {
+                    "success": False,
+                    "return_code": 124,
+                    "stdout": result.stdout,
+                    "stderr": f"Echidna command timeout (exceeded {timeout} seconds)",
+                    "truncated": result.truncated,
+                    "log_file": log_file,
+                    "command": validated_command,
+                    "cwd": str(self.project_root),
+                }
+            
             return {
-                "success": result.returncode == 0,
-                "return_code": result.returncode,
+                "success": result.return_code == 0,
+                "return_code": result.return_code,
                 "stdout": result.stdout,
                 "stderr": result.stderr,
-                "command": validated_command,
-                "cwd": str(self.project_root),
-            }
-
-        except subprocess.TimeoutExpired:
-            return {
-                "success": False,
-                "return_code": 124,
-                "stdout": "",
-                "stderr": f"Echidna command timeout (exceeded {timeout} seconds)",
+                "truncated": result.truncated,
+                "log_file": log_file,
                 "command": validated_command,
                 "cwd": str(self.project_root),
             }
@@ -0,0 +1,223 @@
+import os
+import signal
+import subprocess
+import threading
+import time
+import uuid
+import logging
+from collections import deque
+from contextlib import nullcontext
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# Per-stream cap on command output kept in results and tool responses (head + tail)
+MAX_OUTPUT_CHARS = 64 * 1024
+
+# Write buffer for run_streaming's full-output log files
+LOG_BUFFER_SIZE = 1024 * 1024
+
+
+@dataclass(slots=True)
+class ProcessOutput:
+    """Output collected from a streamed subprocess"""
+    return_code: int
+    stdout: str
+    stderr: str
+    timed_out: bool = False
+    # Full length of stdout as produced, before the head/tail window
+    stdout_chars: int = 0
+    # Characters cut from stdout and stderr by the window
+    dropped_chars: int = 0
+    
+    @property
+    def truncated(self) -> bool:
+        return self.dropped_chars > 0
+
+
+class OutputWindow:
+    """Collects a stream's lines, keeping only its head and tail past a character budget.
+    
+    The first half of the budget is filled with the head of the stream; after
+    that a rolling tail fills the rest, so memory stays bounded however long
+    the process runs. With max_chars=None everything is kept.
+    """
+    
+    def __init__(self, max_chars: Optional[int] = None):
+        self.max_chars = max_chars
+        self.head: List[str] = []
+        self.head_chars = 0
+        self.tail: deque = deque()
+        self.tail_chars = 0
+        self.total_chars = 0
+        self.dropped_chars = 0
+    
+    def append(self, line: str) -> None:
+        self.total_chars += len(line)
+        if self.max_chars is None:
+            self.head.append(line)
+            return
+        
+        if not self.tail and self.head_chars + len(line) <= self.max_chars // 2:
+            self.head.append(line)
+            self.head_chars += len(line)
+            return
+        
+        self.tail.append(line)
+        self.tail_chars += len(line)
+        budget = self.max_chars - self.head_chars
+        
+        while self.tail_chars > budget and len(self.tail) > 1:
+            dropped = self.tail.popleft()
+            self.tail_chars -= len(dropped)
+            self.dropped_chars += len(dropped)
+        
+        if self.tail_chars > budget:
+            # A single line longer than the budget: keep its end
+            cut = self.tail_chars - budget
+            self.tail[0] = self.tail[0][cut:]
+            self.tail_chars -= cut
+            self.dropped_chars += cut
+    
+    @property
+    def truncated(self) -> bool:
+        return self.dropped_chars > 0
+    
+    def text(self) -> str:
+        head = "".join(self.head)
+        tail = "".join(self.tail)
+        if not self.truncated:
+            return head + tail
+        return f"{head}\n... [{self.dropped_chars} characters truncated] ...\n{tail}"
+
+
+def new_log_path(name: str) -> str:
+    """Project-relative path for a run's full-output log, e.g. .logs/echidna-20240101-120000-1a2b3c4d.log"""
+    return f".logs/{name}-{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}.log"
+
+
+def _drain(
+    stream: IO[str],
+    sink: OutputWindow,
+    log: Optional[IO[str]] = None,
+    log_lock: Optional[threading.Lock] = None,
+) -> None:
+    """Read a pipe line by line until EOF, optionally copying every line to a shared log file.
+    
+    A failing sink or log write only disables that destination: the pipe keeps
+    being drained so the child never blocks on, or is killed by, a closed pipe.
+    """
+    keep_output = True
+    keep_log = log is not None
+    try:
+        for line in stream:
+            if keep_output:
+                try:
+                    sink.append(line)
+                except Exception:
+                    logger.exception("Error collecting command output; discarding the rest")
+                    keep_output = False
+            if keep_log:
+                try:
+                    with log_lock:
+                        log.write(line)
+                except Exception:
+                    logger.exception("Error writing command log; logging disabled for this run")
+                    keep_log = False
+    finally:
+        stream.close()
+
+
+def _kill_tree(proc: subprocess.Popen) -> None:
+    """Kill a process started by run_streaming together with its children.
+    
+    forge and echidna spawn solc/crytic-compile; a surviving grandchild would
+    keep the pipes open and the readers waiting after the parent is killed.
+    """
+    if hasattr(os, "killpg"):
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)
+            return
+        except ProcessLookupError:
+            pass
+    proc.kill()
+
+
+def run_streaming(
+    cmd: List[str],
+    cwd: Optional[Union[str, Path]] = None,
+    timeout: Optional[float] = None,
+    max_chars: Optional[int] = None,
+    log_path: Optional[Union[str, Path]] = None,
+) -> ProcessOutput:
+    """Run a command and read its stdout/stderr line by line while it runs.
+
+    Both pipes are drained incrementally by reader threads instead of being
+    buffered by `subprocess.run(capture_output=True)`. On timeout the process
+    is killed and the output produced so far is returned with `timed_out=True`.
+
+    Args:
+        cmd: Command and arguments
+        cwd: Working directory for the command
+        timeout: Seconds to wait before killing the process (None waits forever)
+        max_chars: Per-stream budget; longer output keeps its head and tail
+            with a truncation marker in between (None keeps everything)
+        log_path: If set, the complete interleaved stdout/stderr is also written
+            to this file, so nothing is lost to max_chars
+
+    Raises:
+        OSError: If the command cannot be started (e.g. FileNotFoundError)
+    """
+    stdout_window = OutputWindow(max_chars)
+    stderr_window = OutputWindow(max_chars)
+    log_lock = threading.Lock()
+    timed_out = False
+
+    if log_path is not None:
+        Path(log_path).parent.mkdir(parents=True, exist_ok=True)
+        log_file = open(log_path, "w", encoding="utf-8", buffering=LOG_BUFFER_SIZE)
+    else:
+        log_file = nullcontext()
+
+    with log_file as log, subprocess.Popen(
+        cmd,
+        cwd=cwd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        # Tool output is not guaranteed UTF-8; a stray byte must not kill the reader
+        encoding="utf-8",
+        errors="replace",
+        bufsize=1,
+        start_new_session=hasattr(os, "killpg"),
+    ) as proc:
+        readers = [
+            threading.Thread(target=_drain, args=(proc.stdout, stdout_window, log, log_lock), daemon=True),
+            threading.Thread(target=_drain, args=(proc.stderr, stderr_window, log, log_lock), daemon=True),
+        ]
+        for reader in readers:
+            reader.start()
+
+        try:
+            proc.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            logger.warning(f"Command timed out after {timeout}s, killing: {cmd[0]}")
+            _kill_tree(proc)
+            proc.wait()
+            timed_out = True
+        except BaseException:
+            _kill_tree(proc)
+            raise
+        finally:
+            for reader in readers:
+                reader.join()
+
+    return ProcessOutput(
+        return_code=proc.returncode,
+        stdout=stdout_window.text(),
+        stderr=stderr_window.text(),
+        timed_out=timed_out,
+        stdout_chars=stdout_window.total_chars,
+        dropped_chars=stdout_window.dropped_chars + stderr_window.dropped_chars,
+    )
@@ -1,20 +1,68 @@
 import subprocess
+import fnmatch
 import json
+import os
 import shutil
 import tempfile
+import threading
+from stat import S_ISREG
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Tuple
-from dataclasses import dataclass, asdict
+from typing import Callable, Dict, List, Optional, Any, Set, Tuple, Union
+from dataclasses import dataclass, fields
 from enum import Enum
+from functools import cached_property, lru_cache
 import logging
 import time
 import re
 
+from .process import MAX_OUTPUT_CHARS, run_streaming
+
+try:
+    from .chain import stop_project_anvil
+except ImportError:  # Anvil management is not shipped with every install
+    stop_project_anvil = None
+
 logger = logging.getLogger(__name__)
 
 MAX_FILE_SIZE = 5 * 1024 * 1024  # 5MB
 MAX_TOTAL_FILES = 1000
+MAX_TOTAL_READ_BYTES = 20 * 1024 * 1024  # per get_files_content call
+MAX_FILE_WORKERS = 8
+REWRITE_COMPARE_BLOCK = 64 * 1024  # block size when comparing a file against new content
+
+# Per-entry fields returned by list_project_files
+LISTING_FILE_FIELDS = ("name", "path", "size_bytes", "modified_at", "extension")
+LISTING_DIR_FIELDS = ("name", "path")
+
+# One bounded pool for batched file reads/writes and project removal. Callers
+# already run on the server's I/O threads, so per-call pools would multiply
+# thread counts under concurrent requests; tasks never submit to this pool themselves.
+_FILE_POOL = ThreadPoolExecutor(max_workers=MAX_FILE_WORKERS, thread_name_prefix="project-files")
+
+def _map_in_order(fn: Callable, items: List[Any]) -> List[Any]:
+    """fn over items on the shared file pool, results in input order; a single item runs inline"""
+    if len(items) <= 1:
+        return [fn(item) for item in items]
+    return list(_FILE_POOL.map(fn, items))
+
+def _file_is_prefix(f, data: bytes, size: int) -> bool:
+    """Whether the first size bytes of data equal the file's content, read in blocks from the start"""
+    view = memoryview(data)
+    f.seek(0)
+    offset = 0
+    while offset < size:
+        block = f.read(min(REWRITE_COMPARE_BLOCK, size - offset))
+        if not block or view[offset:offset + len(block)] != block:
+            return False
+        offset += len(block)
+    return True
+
+@lru_cache(maxsize=1024)
+def _resolve_root(base_path: str) -> str:
+    """Resolve a project root once; roots do not move while a project exists"""
+    return os.path.realpath(base_path)
 
 class ProjectType(Enum):
     """Supported project types"""
@@ -37,8 +85,19 @@ class ProjectConfig:
         if self.created_at == 0.0:
             self.created_at = time.time()
     
+    @cached_property
+    def path(self) -> Path:
+        """project_path as a Path, built once per project"""
+        return Path(self.project_path)
+    
+    @cached_property
+    def resolved_path(self) -> Path:
+        """project_path with symlinks resolved, computed once per project"""
+        return self.path.resolve()
+    
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        # All fields are scalars, so asdict()'s recursive deep copy is wasted work
+        return {f.name: getattr(self, f.name) for f in fields(self)}
 
 class SecurityError(Exception):
     """Custom exception for security violations"""
@@ -62,42 +121,51 @@ class ProjectManager:
             SecurityError: If path is invalid or outside allowed directory
         """
         try:
-            base_path_resolved = base_path.resolve()
+            base_path_resolved = _resolve_root(str(base_path))
         except (OSError, ValueError) as e:
             raise SecurityError(f"Invalid base path: {e}")
         
         try:
-            requested_path_obj = Path(requested_path)
+            # join() keeps an absolute requested_path as-is, matching the old behaviour
+            joined_path = os.path.join(base_path_resolved, requested_path)
             
-            if requested_path_obj.is_absolute():
-                target_path = requested_path_obj.resolve()
-            else:
-                target_path = (base_path_resolved / requested_path).resolve()
-            
-            try:
-                target_path.relative_to(base_path_resolved)
-            except ValueError:
-                raise SecurityError(f"Path outside allowed directory: {requested_path}")
+            # Lexical check first: plain ../ or absolute escapes are rejected without any syscalls
+            is_inside = os.path.commonpath([os.path.normpath(joined_path), base_path_resolved]) == base_path_resolved
             
-            return target_path
-        
+            # realpath still runs on the joined path so symlinks pointing outside are caught
+            if is_inside:
+                target_path = os.path.realpath(joined_path)
+                is_inside = os.path.commonpath([target_path, base_path_resolved]) == base_path_resolved
         except (OSError, ValueError) as e:
             raise SecurityError(f"Invalid path: {e}")
+        
+        if not is_inside:
+            raise SecurityError(f"Path outside allowed directory: {requested_path}")
+        
+        return Path(target_path)
     
     @staticmethod
-    def validate_file_size(content: str) -> None:
+    def validate_file_size(content: Union[str, bytes]) -> None:
         """Check if file content size is within limits
         
+        Args:
+            content: Text, or its already UTF-8 encoded bytes
+        
         Raises:
             SecurityError: If content exceeds MAX_FILE_SIZE
         """
-        if len(content.encode('utf-8')) > MAX_FILE_SIZE:
+        if isinstance(content, str):
+            content = content.encode('utf-8')
+        if len(content) > MAX_FILE_SIZE:
             raise SecurityError("Content too large")
     
     def __init__(self, base_dir: str = None):
         self.base_dir = Path(base_dir) if base_dir else Path(tempfile.gettempdir()) / "mcp_projects"
         self.base_dir.mkdir(exist_ok=True)
         self.projects: Dict[str, Dict[str, ProjectConfig]] = {}
+        # Tools run on worker threads: every read-modify-write of self.projects
+        # and every metadata save happens under this lock
+        self._lock = threading.RLock()
         self._load_projects()
     
     def _load_projects(self):
@@ -136,22 +204,32 @@ class ProjectManager:
     def _save_projects(self):
         """Save projects metadata"""
         metadata_file = self.base_dir / ".projects_metadata.json"
-        try:
-            data = {}
-            for user_id, user_projects in self.projects.items():
-                data[user_id] = {}
-                for project_id, project in user_projects.items():
-                    project_dict = project.to_dict()
-                    project_dict['project_type'] = project.project_type.value
-                    data[user_id][project_id] = project_dict
-            
-            with open(metadata_file, 'w') as f:
-                json.dump(data, f, indent=2)
-            
-            total_projects = sum(len(projects) for projects in self.projects.values())
-            logger.info(f"Saved {total_projects} projects metadata across {len(self.projects)} users")
-        except Exception as e:
-            logger.error(f"Error saving projects metadata: {e}")
+        with self._lock:
+            try:
+                data = {}
+                for user_id, user_projects in self.projects.items():
+                    data[user_id] = {}
+                    for project_id, project in user_projects.items():
+                        project_dict = project.to_dict()
+                        project_dict['project_type'] = project.project_type.value
+                        data[user_id][project_id] = project_dict
+                
+                # Compact JSON in one write, to a temp file that replaces the old one atomically:
+                # a crash or a concurrent save never leaves a half-written metadata file
+                payload = json.dumps(data, separators=(",", ":"))
+                fd, tmp_path = tempfile.mkstemp(dir=self.base_dir, prefix=".projects_metadata.", suffix=".tmp")
+                try:
+                    with open(fd, 'w') as f:
+                        f.write(payload)
+                    os.replace(tmp_path, metadata_file)
+                except BaseException:
+                    os.unlink(tmp_path)
+                    raise
+                
+                total_projects = sum(len(projects) for projects in self.projects.values())
+                logger.info(f"Saved {total_projects} projects metadata across {len(self.projects)} users")
+            except Exception as e:
+                logger.error(f"Error saving projects metadata: {e}")
     
     def create_project(
         self,
@@ -192,10 +270,11 @@ class ProjectManager:
             evm_version=evm_version
         )
         
-        if user_id not in self.projects:
-            self.projects[user_id] = {}
-        self.projects[user_id][project_id] = config
-        self._save_projects()
+        with self._lock:
+            if user_id not in self.projects:
+                self.projects[user_id] = {}
+            self.projects[user_id][project_id] = config
+            self._save_projects()
         
         logger.info(f"Created {project_type} project: {project_id} for user {user_id} at {project_path}")
         return config
@@ -300,15 +379,14 @@ class ProjectManager:
     
     def get_project(self, project_id: str, user_id: str = "default") -> Optional[ProjectConfig]:
         """Get project by ID for a specific user"""
-        if user_id not in self.projects:
-            return None
-        return self.projects[user_id].get(project_id)
+        with self._lock:
+            return self.projects.get(user_id, {}).get(project_id)
     
     def list_projects(self, user_id: str = None) -> List[ProjectConfig]:
         """List all projects for a specific user, or all projects if user_id is None"""
-        if user_id:
-            return list(self.projects.get(user_id, {}).values())
-        else:
+        with self._lock:
+            if user_id:
+                return list(self.projects.get(user_id, {}).values())
             all_projects = []
             for user_projects in self.projects.values():
                 all_projects.extend(user_projects.values())
@@ -333,7 +411,7 @@ class ProjectManager:
         if not project:
             return {"success": False, "error": f"Project {project_id} not found for user {user_id}"}
         
-        project_path = Path(project.project_path)
+        project_path = project.path
         
         try:
             validated_path = self.validate_and_resolve_path(script_path, project_path)
@@ -361,7 +439,8 @@ class ProjectManager:
         self,
         project_id: str,
         files: Dict[str, str],
-        user_id: str = "default"
+        user_id: str = "default",
+        must_exist: bool = False
     ) -> Dict[str, Any]:
         """Write multiple files to project with security validation
         
@@ -370,23 +449,32 @@ class ProjectManager:
             files: Dictionary where keys are file paths (can include subdirectories) 
                    and values are file contents
             user_id: User identifier
+            must_exist: If True, every file must already exist (batch modification)
         """
         project = self.get_project(project_id, user_id)
         if not project:
             return {"success": False, "error": f"Project {project_id} not found for user {user_id}"}
-        project_path = Path(project.project_path)
+        project_path = project.path
         
         if len(files) > MAX_TOTAL_FILES:
             return {"success": False, "error": f"Too many files. Maximum allowed: {MAX_TOTAL_FILES}"}
         
         added_files = []
         errors = []
+        action, done = ("modify", "Modified") if must_exist else ("add", "Added")
+        created_dirs: Set[Path] = set()
         
-        for file_path_str, content in files.items():
-            result = self._write_validated_file(
-                project_id, user_id, file_path_str, content, must_exist=False
+        def write_one(item):
+            file_path_str, content = item
+            return self._write_validated_file(
+                project_id, user_id, file_path_str, content,
+                must_exist=must_exist, created_dirs=created_dirs
             )
-            
+        
+        # Files are independent, so write them concurrently
+        results = _map_in_order(write_one, list(files.items()))
+        
+        for (file_path_str, content), result in zip(files.items(), results):
             if result["success"]:
                 file_info = {
                     "filename": Path(file_path_str).name,
@@ -394,12 +482,13 @@ class ProjectManager:
                     "absolute_path": result.get("absolute_path", ""),
                     "original_path": file_path_str,
                     "size": result.get("file_size", len(content.encode('utf-8'))),
+                    "changed": result.get("changed", True),
                     "created_at": time.time()
                 }
                 added_files.append(file_info)
-                logger.info(f"Added file {file_path_str} to project {project_id}")
+                logger.info(f"{done} file {file_path_str} in project {project_id}")
             else:
-                error_msg = f"Failed to add {file_path_str}: {result.get('error', 'Unknown error')}"
+                error_msg = f"Failed to {action} {file_path_str}: {result.get('error', 'Unknown error')}"
                 errors.append(error_msg)
                 logger.error(error_msg)
         
@@ -409,50 +498,78 @@ class ProjectManager:
             "count": len(added_files),
             "total_files": len(files),
             "errors": errors if errors else None,
-            "message": f"Added {len(added_files)}/{len(files)} files to project"
+            "message": f"{done} {len(added_files)}/{len(files)} files in project"
         }
     
-    def cleanup_project(self, project_id: str, user_id: str = "default") -> bool:
-        """Clean up project directory and runtime objects"""
-        project = self.get_project(project_id, user_id)
-        if not project:
-            return False
-        project_path = Path(project.project_path)
-        
+    def _remove_project_files(self, project_id: str, user_id: str, project_path: Path) -> bool:
+        """Stop the project's runtime objects and delete its directory; metadata is left to the caller"""
         try:
-            from .chain import stop_project_anvil
-            try:
-                stop_project_anvil(project_id, user_id)
-            except Exception as e:
-                logger.warning(f"Error stopping Anvil during cleanup: {e}")
+            if stop_project_anvil is not None:
+                try:
+                    stop_project_anvil(project_id, user_id)
+                except Exception as e:
+                    logger.warning(f"Error stopping Anvil during cleanup: {e}")
             
             if project_path.exists():
                 shutil.rmtree(project_path)
-            
+            return True
+        
+        except Exception as e:
+            logger.error(f"Error cleaning up project {project_id}: {e}")
+            return False
+    
+    def _forget_project(self, project_id: str, user_id: str):
+        """Drop a project from the in-memory metadata"""
+        with self._lock:
             if user_id in self.projects and project_id in self.projects[user_id]:
                 del self.projects[user_id][project_id]
                 if not self.projects[user_id]:
                     del self.projects[user_id]
-            self._save_projects()
-            
-            logger.info(f"Cleaned up project {project_id} for user {user_id}")
-            return True
+    
+    def cleanup_project(self, project_id: str, user_id: str = "default") -> bool:
+        """Clean up project directory and runtime objects"""
+        project = self.get_project(project_id, user_id)
+        if not project:
+            return False
         
-        except Exception as e:
-            logger.error(f"Error cleaning up project {project_id}: {e}")
+        if not self._remove_project_files(project_id, user_id, project.path):
             return False
+        
+        _resolve_root.cache_clear()
+        with self._lock:
+            self._forget_project(project_id, user_id)
+            self._save_projects()
+        
+        logger.info(f"Cleaned up project {project_id} for user {user_id}")
+        return True
     
     def cleanup_all_projects(self, user_id: str = None):
-        """Clean up all projects for a specific user, or all projects if user_id is None"""
+        """Clean up all projects for a specific user, or all projects if user_id is None
+        
+        Project directories are removed in parallel; metadata is saved once at the end.
+        """
+        with self._lock:
+            user_ids = [user_id] if user_id else list(self.projects.keys())
+            targets = [
+                (project_id, uid, project.path)
+                for uid in user_ids
+                for project_id, project in self.projects.get(uid, {}).items()
+            ]
+        
+        if targets:
+            removed = _map_in_order(lambda target: self._remove_project_files(*target), targets)
+            
+            _resolve_root.cache_clear()
+            with self._lock:
+                for (project_id, uid, _), ok in zip(targets, removed):
+                    if ok:
+                        self._forget_project(project_id, uid)
+                        logger.info(f"Cleaned up project {project_id} for user {uid}")
+                self._save_projects()
+        
         if user_id:
-            if user_id in self.projects:
-                for project_id in list(self.projects[user_id].keys()):
-                    self.cleanup_project(project_id, user_id)
-                logger.info(f"Cleaned up all projects for user {user_id}")
+            logger.info(f"Cleaned up all projects for user {user_id}")
         else:
-            for user_id_key in list(self.projects.keys()):
-                for project_id in list(self.projects[user_id_key].keys()):
-                    self.cleanup_project(project_id, user_id_key)
             logger.info("Cleaned up all projects for all users")
     
     def cleanup_old_projects(self, max_age_hours: int = 24, user_id: str = None):
@@ -461,14 +578,15 @@ class ProjectManager:
         max_age_seconds = max_age_hours * 3600
         
         old_projects = []
-        users_to_check = [user_id] if user_id else list(self.projects.keys())
-        
-        for user_id_key in users_to_check:
-            if user_id_key not in self.projects:
-                continue
-            for project_id, project in self.projects[user_id_key].items():
-                if current_time - project.created_at > max_age_seconds:
-                    old_projects.append((project_id, user_id_key))
+        with self._lock:
+            users_to_check = [user_id] if user_id else list(self.projects.keys())
+            
+            for user_id_key in users_to_check:
+                if user_id_key not in self.projects:
+                    continue
+                for project_id, project in self.projects[user_id_key].items():
+                    if current_time - project.created_at > max_age_seconds:
+                        old_projects.append((project_id, user_id_key))
         
         for project_id, user_id_key in old_projects:
             self.cleanup_project(project_id, user_id_key)
@@ -476,16 +594,34 @@ class ProjectManager:
         logger.info(f"Cleaned up {len(old_projects)} old projects")
         return len(old_projects)
     
-    def install_dependency(self, project_id: str, dependency_url: str, user_id: str = "default", branch: str = None) -> Dict[str, Any]:
-        """Install external dependency using forge install"""
+    def install_dependency(
+        self,
+        project_id: str,
+        dependency_url: str,
+        user_id: str = "default",
+        branch: str = None,
+        shallow: bool = True
+    ) -> Dict[str, Any]:
+        """Install external dependency using forge install
+        
+        Args:
+            project_id: Project identifier
+            dependency_url: Git URL or GitHub "owner/repo" of the dependency
+            user_id: User identifier
+            branch: Branch, tag or commit to install
+            shallow: Clone without history (forge install --shallow); the
+                checked-out ref is all a build needs and far less is fetched
+        """
         project = self.get_project(project_id, user_id)
         if not project:
             return {"success": False, "error": f"Project {project_id} not found for user {user_id}"}
-        project_path = Path(project.project_path)
+        project_path = project.path
         
         
         try:
             cmd = ["forge", "install"]
+            if shallow:
+                cmd.append("--shallow")
             
             if branch:
                 if dependency_url.endswith('.git'):
@@ -495,21 +631,20 @@ class ProjectManager:
                 cmd.append(dependency_url)
             
             logger.info(f"Installing dependency: {dependency_url}")
-            result = subprocess.run(
-                cmd,
-                cwd=project_path,
-                capture_output=True,
-                text=True,
-                timeout=120
-            )
+            result = run_streaming(cmd, cwd=project_path, timeout=120, max_chars=MAX_OUTPUT_CHARS)
             
-            if result.returncode == 0:
+            if result.timed_out:
+                return {"success": False, "error": "Dependency installation timeout"}
+            
+            if result.return_code == 0:
                 logger.info(f"Successfully installed dependency: {dependency_url}")
                 return {
                     "success": True,
                     "dependency_url": dependency_url,
                     "branch": branch,
                     "output": result.stdout,
+                    "output_chars": result.stdout_chars,
+                    "dropped_chars": result.dropped_chars,
                     "message": f"Successfully installed {dependency_url}"
                 }
             else:
@@ -517,27 +652,45 @@ class ProjectManager:
                 return {
                     "success": False,
                     "error": result.stderr,
-                    "output": result.stdout
+                    "output": result.stdout,
+                    "output_chars": result.stdout_chars,
+                    "dropped_chars": result.dropped_chars
                 }
         
-        except subprocess.TimeoutExpired:
-            return {"success": False, "error": "Dependency installation timeout"}
         except Exception as e:
             logger.error(f"Error installing dependency: {e}")
             return {"success": False, "error": str(e)}
     
-    def get_file_content(self, project_id: str, file_path: str, user_id: str = "default") -> Dict[str, Any]:
+    def get_file_content(
+        self,
+        project_id: str,
+        file_path: str,
+        user_id: str = "default",
+        reserve: Optional[Callable[[int], bool]] = None,
+        offset: int = 0,
+        length: Optional[int] = None
+    ) -> Dict[str, Any]:
         """Get content of any file from project directory with security validation
         
+        Files up to MAX_FILE_SIZE are returned whole by default. Larger files, or
+        any file when offset/length are given, are returned as a byte range of at
+        most MAX_FILE_SIZE; "next_offset" is where the following range starts
+        (None at end of file) and metadata.size_bytes is the full size.
+        
         Args:
             project_id: Project identifier
             file_path: Path to file relative to project root (e.g., "src/Contract.sol", "test/Test.t.sol")
             user_id: User identifier
+            reserve: Called with the number of bytes about to be read; returning
+                False rejects the file instead of reading it (used for batch byte budgets)
+            offset: Byte offset to start reading at; negative counts from the end
+                of the file (e.g. -65536 for the last 64 KiB of a log)
+            length: Maximum number of bytes to read (capped at MAX_FILE_SIZE)
         """
         project = self.get_project(project_id, user_id)
         if not project:
             return {"success": False, "error": f"Project {project_id} not found for user {user_id}"}
-        project_path = Path(project.project_path)
+        project_path = project.path
         
         try:
             try:
@@ -545,27 +698,61 @@ class ProjectManager:
             except SecurityError as e:
                 return {"success": False, "error": str(e)}
             
-            if not validated_path.exists():
+            # Open first and ask the open descriptor what it is, instead of
+            # exists()/is_file()/stat() on the path: fewer syscalls and no window
+            # for the file to change between the checks and the read.
+            # O_NONBLOCK keeps a FIFO from blocking the open; it is ignored for regular files
+            try:
+                fd = os.open(validated_path, os.O_RDONLY | getattr(os, "O_NONBLOCK", 0))
+            except FileNotFoundError:
                 return {
                     "success": False,
                     "error": f"File not found: {file_path}"
                 }
             
-            if not validated_path.is_file():
-                return {
-                    "success": False,
-                    "error": f"Path is not a file: {file_path}"
-                }
+            try:
+                stat = os.fstat(fd)
+                if not S_ISREG(stat.st_mode):
+                    return {
+                        "success": False,
+                        "error": f"Path is not a file: {file_path}"
+                    }
+                
+                # At most MAX_FILE_SIZE bytes per response, the same limit as for
+                # writes: larger files (logs, build output) are served in ranges
+                start = max(0, stat.st_size + offset) if offset < 0 else min(offset, stat.st_size)
+                size = min(MAX_FILE_SIZE if length is None else max(0, length), MAX_FILE_SIZE)
+                size = min(size, stat.st_size - start)
+                partial = size < stat.st_size
+                
+                if reserve is not None and not reserve(size):
+                    return {
+                        "success": False,
+                        "error": f"Read budget exceeded: {file_path} ({size} bytes) not read",
+                        "size_bytes": stat.st_size
+                    }
+                
+                if partial:
+                    raw = os.pread(fd, size, start)
+                else:
+                    with open(fd, 'rb', closefd=False) as f:
+                        raw = f.read()
+            finally:
+                os.close(fd)
             
             try:
-                content = validated_path.read_text(encoding="utf-8")
+                # One decode of the raw bytes; text mode would also decode chunk-wise and translate newlines
+                content = raw.decode("utf-8")
             except UnicodeDecodeError:
-                return {
-                    "success": False,
-                    "error": f"File encoding error: {file_path}"
-                }
+                if not partial:
+                    return {
+                        "success": False,
+                        "error": f"File encoding error: {file_path}"
+                    }
+                # A range boundary can split a multi-byte character
+                content = raw.decode("utf-8", errors="replace")
             
-            stat = validated_path.stat()
+            end = start + len(raw)
             
             return {
                 "success": True,
@@ -578,6 +765,10 @@ class ProjectManager:
                     "modified_at": stat.st_mtime,
                     "is_readable": True
                 },
+                "offset": start,
+                "bytes_read": len(raw),
+                "next_offset": end if end < stat.st_size else None,
+                "truncated": partial,
                 "project_id": project_id
             }
             
@@ -588,7 +779,63 @@ class ProjectManager:
                 "error": str(e)
             }
     
-    def list_project_files(self, project_id: str, user_id: str = "default", directory: str = None, file_pattern: str = None) -> Dict[str, Any]:
+    def get_files_content(self, project_id: str, file_paths: List[str], user_id: str = "default") -> Dict[str, Any]:
+        """Read several project files in one call
+        
+        Args:
+            project_id: Project identifier
+            file_paths: Paths relative to project root
+            user_id: User identifier
+        
+        Returns:
+            Dict with per-file get_file_content results under "files", keyed by path.
+            Once MAX_TOTAL_READ_BYTES have been read, remaining files are reported
+            as errors instead of being read.
+        """
+        if not self.get_project(project_id, user_id):
+            return {"success": False, "error": f"Project {project_id} not found for user {user_id}"}
+        
+        if len(file_paths) > MAX_TOTAL_FILES:
+            return {"success": False, "error": f"Too many files. Maximum allowed: {MAX_TOTAL_FILES}"}
+        
+        paths = list(dict.fromkeys(file_paths))
+        budget_lock = threading.Lock()
+        bytes_read = 0
+        
+        def reserve(size):
+            nonlocal bytes_read
+            with budget_lock:
+                if bytes_read + size > MAX_TOTAL_READ_BYTES:
+                    return False
+                bytes_read += size
+                return True
+        
+        def read_one(file_path):
+            return self.get_file_content(project_id, file_path, user_id, reserve=reserve)
+        
+        # Reads are independent and release the GIL, so overlap them like batched writes
+        results = _map_in_order(read_one, paths)
+        
+        files = dict(zip(paths, results))
+        errors = [f"{path}: {result['error']}" for path, result in files.items() if not result["success"]]
+        
+        return {
+            "success": not errors,
+            "project_id": project_id,
+            "files": files,
+            "count": len(files) - len(errors),
+            "total_files": len(files),
+            "errors": errors or None
+        }
+    
+    def list_project_files(
+        self,
+        project_id: str,
+        user_id: str = "default",
+        directory: str = None,
+        file_pattern: str = None,
+        columnar: bool = False
+    ) -> Dict[str, Any]:
         """List files in project directory with security validation
         
         Args:
@@ -596,11 +843,13 @@ class ProjectManager:
             user_id: User identifier
             directory: Subdirectory to list (e.g., "src", "test", "script"). If None, lists root directory
             file_pattern: File pattern to filter (e.g., "*.sol", "*.t.sol"). If None, lists all files
+            columnar: Return "files"/"directories" as one list per field (LISTING_FILE_FIELDS /
+                LISTING_DIR_FIELDS) instead of one dict per entry
         """
         project = self.get_project(project_id, user_id)
         if not project:
             return {"success": False, "error": f"Project {project_id} not found for user {user_id}"}
-        project_path = Path(project.project_path)
+        project_path = project.path
         
         try:
             if directory:
@@ -613,56 +862,86 @@ class ProjectManager:
             else:
                 target_dir = project_path
             
-            if not target_dir.exists():
+            # Per-entry file filter, built once; None (no pattern) lists every file without a filter call
+            matches = None
+            if file_pattern:
+                suffix = file_pattern[1:]
+                if "/" in file_pattern:
+                    matches = lambda entry: Path(entry.path).match(file_pattern)
+                elif file_pattern.startswith("*") and not any(c in suffix for c in "*?["):
+                    # Pure suffix patterns ("*.sol", "*.t.sol") need no regex at all
+                    matches = lambda entry: entry.name.endswith(suffix)
+                else:
+                    # Other name-only patterns: one compiled regex instead of Path.match per entry
+                    name_regex = re.compile(fnmatch.translate(file_pattern)).match
+                    matches = lambda entry: name_regex(entry.name) is not None
+            
+            root = str(project.resolved_path)
+            rel_dir = os.path.relpath(target_dir, root) if directory else "."
+            
+            files = []
+            directories = []
+            
+            # scandir reports file types from the directory read itself, and a
+            # missing or non-directory target surfaces as the scandir error
+            try:
+                entries = os.scandir(target_dir)
+            except FileNotFoundError:
                 return {
                     "success": False,
                     "error": f"Directory not found: {directory or 'root'}"
                 }
-            
-            if not target_dir.is_dir():
+            except NotADirectoryError:
                 return {
                     "success": False,
                     "error": f"Path is not a directory: {directory or 'root'}"
                 }
             
-            files = []
-            directories = []
-            
-            for item in target_dir.iterdir():
-                try:
-                    item.resolve().relative_to(project_path.resolve())
-                except ValueError:
-                    continue  # Skip items outside project directory
-                
-                relative_path = item.relative_to(project_path)
-                
-                if item.is_file():
-                    if file_pattern and not item.match(file_pattern):
-                        continue
+            with entries:
+                for entry in entries:
+                    # target_dir is inside the project, so only symlinks can point outside it
+                    if entry.is_symlink() and os.path.commonpath([os.path.realpath(entry.path), root]) != root:
+                        continue  # Skip items outside project directory
                     
-                    stat = item.stat()
-                    files.append({
-                        "name": item.name,
-                        "path": str(relative_path),
-                        "size_bytes": stat.st_size,
-                        "modified_at": stat.st_mtime,
-                        "extension": item.suffix,
-                        "is_file": True
-                    })
-                
-                elif item.is_dir():
-                    directories.append({
-                        "name": item.name,
-                        "path": str(relative_path),
-                        "is_file": False
-                    })
+                    if entry.is_file():
+                        if matches is not None and not matches(entry):
+                            continue
+                        
+                        relative_path = entry.name if rel_dir == "." else os.path.join(rel_dir, entry.name)
+                        stat = entry.stat()
+                        extension = os.path.splitext(entry.name)[1]
+                        # Rows in LISTING_FILE_FIELDS order; shaped into dicts or columns below
+                        files.append((
+                            entry.name,
+                            relative_path,
+                            stat.st_size,
+                            stat.st_mtime,
+                            extension if extension != "." else "",  # same as Path.suffix
+                        ))
+                    
+                    elif entry.is_dir():
+                        directories.append((
+                            entry.name,
+                            entry.name if rel_dir == "." else os.path.join(rel_dir, entry.name),
+                        ))
+            
+            # Names are unique within a directory, so tuple order is name order
+            files.sort()
+            directories.sort()
+            
+            if columnar:
+                files_out = {field: [row[i] for row in files] for i, field in enumerate(LISTING_FILE_FIELDS)}
+                directories_out = {field: [row[i] for row in directories] for i, field in enumerate(LISTING_DIR_FIELDS)}
+            else:
+                files_out = [dict(zip(LISTING_FILE_FIELDS, row), is_file=True) for row in files]
+                directories_out = [dict(zip(LISTING_DIR_FIELDS, row), is_file=False) for row in directories]
             
             return {
                 "success": True,
                 "directory": directory or "root",
                 "project_id": project_id,
-                "files": sorted(files, key=lambda x: x["name"]),
-                "directories": sorted(directories, key=lambda x: x["name"]),
+                "files": files_out,
+                "directories": directories_out,
                 "total_files": len(files),
                 "total_directories": len(directories),
                 "file_pattern": file_pattern
@@ -714,13 +993,45 @@ class ProjectManager:
         
         return modified_content
     
+    @staticmethod
+    def _rewrite_file(path: Path, data: bytes) -> bool:
+        """Replace an existing file's content, appending only the delta when possible
+        
+        Edits that add to the end of a file (a new function, an extra import
+        at the bottom) keep the old content as a prefix; for those only the
+        new tail is written instead of truncating and rewriting the file.
+        
+        The old content is compared block by block and the comparison stops at
+        the first differing block, so an ordinary edit reads little of the file
+        and a file longer than the new content is not read at all. Confirming
+        an append (or an unchanged file) still reads the whole old content:
+        anything less could append to a file whose middle had changed.
+        
+        Returns:
+            False if the file already held exactly this content and was left
+            untouched (its mtime is kept, so forge does not see a change)
+        """
+        with open(path, 'r+b') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size <= len(data) and _file_is_prefix(f, data, size):
+                if size == len(data):
+                    return False
+                f.seek(size)
+                f.write(memoryview(data)[size:])
+            else:
+                f.seek(0)
+                f.write(data)
+                f.truncate()
+        return True
+    
     def _write_validated_file(
         self,
         project_id: str,
         user_id: str,
         file_path: str,
         content: str,
-        must_exist: bool = False
+        must_exist: bool = False,
+        created_dirs: Optional[Set[Path]] = None
     ) -> Dict[str, Any]:
         """Internal helper to write file content with validation
         
@@ -730,6 +1041,8 @@ class ProjectManager:
             file_path: Path to file relative to project root
             content: File content to write
             must_exist: If True, file must exist (for modification). If False, file can be created.
+            created_dirs: Parent directories already created by this batch; shared
+                across a multi-file write so each directory is created only once
         
         Returns:
             Dict with success status and file information or error
@@ -738,7 +1051,7 @@ class ProjectManager:
         if not project:
             return {"success": False, "error": f"Project {project_id} not found for user {user_id}"}
         
-        project_path = Path(project.project_path)
+        project_path = project.path
         
         try:
             validated_path = self.validate_and_resolve_path(file_path, project_path)
@@ -753,17 +1066,27 @@ class ProjectManager:
             if validated_path.is_dir():
                 return {"success": False, "error": f"Path {file_path} is a directory, not a file"}
         
+        # Encode once: the same bytes are size-checked, written and reported
+        data = content.encode('utf-8')
         try:
-            self.validate_file_size(content)
+            self.validate_file_size(data)
         except SecurityError as e:
             return {"success": False, "error": f"Content validation failed: {e}"}
         
         if not must_exist:
-            validated_path.parent.mkdir(parents=True, exist_ok=True)
+            parent = validated_path.parent
+            if created_dirs is None or parent not in created_dirs:
+                parent.mkdir(parents=True, exist_ok=True)
+                if created_dirs is not None:
+                    created_dirs.add(parent)
         
+        changed = True
         try:
-            with open(validated_path, 'w', encoding='utf-8') as f:
-                f.write(content)
+            if must_exist:
+                changed = self._rewrite_file(validated_path, data)
+            else:
+                with open(validated_path, 'wb') as f:
+                    f.write(data)
         except Exception as e:
             return {"success": False, "error": f"Error writing file: {e}"}
         
@@ -771,7 +1094,8 @@ class ProjectManager:
             "success": True,
             "file_path": file_path,
             "absolute_path": str(validated_path),
-            "file_size": len(content.encode('utf-8'))
+            "file_size": len(data),
+            "changed": changed
         }
 
 
@@ -1,18 +1,198 @@
 from mcp_modules.project_secure import (
-    ProjectType, get_project_manager, SecurityError
+    ProjectType, ProjectConfig, get_project_manager, SecurityError
 )
 from mcp.server.fastmcp import FastMCP
-from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Union, Callable, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from mcp_modules.build import BuildManager, BuildConfig, BuildToolchain
 from mcp_modules.echidna_runner import EchidnaRunner
+from mcp_modules.process import MAX_OUTPUT_CHARS
+import asyncio
+import atexit
+import functools
 import logging
+import os
+import queue
+import shutil
+import stat
+from logging.handlers import QueueHandler, QueueListener
 
 mcp = FastMCP("Smart Contract Project Manager")
 
 logging.basicConfig(level=logging.INFO)
+
+
+def _queue_root_logging() -> None:
+    """Move the root handlers (FastMCP's or basicConfig's) behind a queue.
+    
+    Tools log from the event loop; with a QueueHandler a log call is an enqueue,
+    and the stream write with its handler lock happens on the listener thread.
+    """
+    root = logging.getLogger()
+    handlers = root.handlers[:]
+    if not handlers:
+        return
+    
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    root.handlers = [QueueHandler(log_queue)]
+    listener.start()
+    atexit.register(listener.stop)
+
+
+_queue_root_logging()
 logger = logging.getLogger(__name__)
 project_manager = get_project_manager()
 
+_PROJECT_TYPES_LIST = [t.value for t in ProjectType]
+_PROJECT_TYPES = frozenset(_PROJECT_TYPES_LIST)
+_TX_TYPES = frozenset({"legacy", "1559"})
+
+# forge/solc/echidna children are CPU-heavy, so they get a small bounded pool;
+# plain filesystem work gets a wider one so it is never stuck behind a compile
+_CPU_POOL = ThreadPoolExecutor(max_workers=max(2, (os.cpu_count() or 2) // 2), thread_name_prefix="mcp-cpu")
+_IO_POOL = ThreadPoolExecutor(max_workers=32, thread_name_prefix="mcp-io")
+
+
+def _shutdown_pools() -> None:
+    _CPU_POOL.shutdown(wait=False, cancel_futures=True)
+    _IO_POOL.shutdown(wait=False, cancel_futures=True)
+
+
+atexit.register(_shutdown_pools)
+
+# forge install is network-bound (git clone), so it runs on the I/O pool instead of
+# holding a CPU slot, with a cap on how many clones run at once
+MAX_CONCURRENT_INSTALLS = 4
+_install_slots = asyncio.Semaphore(MAX_CONCURRENT_INSTALLS)
+
+
+async def _run_cpu(fn: Callable, *args, **kwargs) -> Any:
+    """Run a subprocess-heavy call (compile, tests, script, fuzzing) on the bounded CPU pool"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_CPU_POOL, functools.partial(fn, *args, **kwargs))
+
+
+async def _run_io(fn: Callable, *args, **kwargs) -> Any:
+    """Run a blocking filesystem call on the I/O pool"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_IO_POOL, functools.partial(fn, *args, **kwargs))
+
+
+# One lock per resolved project root: forge build/test/script/install share out/,
+# cache/ and lib/, so runs in one project are serialized. The wait happens on the
+# event loop, before a pool thread is taken, so a busy project never ties up
+# workers other projects need. Never evicted (unlike the BuildManager cache), so
+# every caller for a root always sees the same lock.
+_forge_locks: Dict[str, asyncio.Lock] = {}
+
+
+def _forge_lock(project: ProjectConfig) -> asyncio.Lock:
+    """The forge lock for a project's root directory"""
+    return _forge_locks.setdefault(str(project.resolved_path), asyncio.Lock())
+
+
+# Compiles still waiting for their project's forge lock, keyed by (project root, config).
+# A compile requested meanwhile joins one: it has not read the sources yet, so its
+# result reflects every write made before the join.
+_pending_compiles: Dict[Tuple[str, BuildConfig], asyncio.Future] = {}
+
+
+async def _compile(project: ProjectConfig, config: BuildConfig) -> Any:
+    """Compile a project on the CPU pool, serialized with other forge runs on it"""
+    key = (str(project.resolved_path), config)
+    future = _pending_compiles.get(key)
+    if future is None:
+        future = asyncio.ensure_future(_run_compile(project, config, key))
+        _pending_compiles[key] = future
+        future.add_done_callback(
+            lambda done: _pending_compiles.pop(key) if _pending_compiles.get(key) is done else None
+        )
+    # shield: one caller giving up must not cancel the run the others are waiting on
+    return await asyncio.shield(future)
+
+
+async def _run_compile(project: ProjectConfig, config: BuildConfig, key: Tuple[str, BuildConfig]) -> Any:
+    async with _forge_lock(project):
+        # The sources are read from here on: later requests need a run of their own
+        if _pending_compiles.get(key) is asyncio.current_task():
+            del _pending_compiles[key]
+        build_manager = _get_build_manager(project.project_path)
+        source_files, cache_key = await _run_io(build_manager.source_fingerprint, config)
+        return await _run_cpu(build_manager.compile, config, source_files, cache_key)
+
+
+def _tool_errors(action: str) -> Callable:
+    """Turn an unexpected exception in a tool into the standard error response.
+    
+    Goes under @mcp.tool; functools.wraps keeps the signature FastMCP builds
+    the tool schema from.
+    """
+    def decorator(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs) -> Dict[str, Any]:
+            try:
+                return await fn(*args, **kwargs)
+            except SecurityError as e:
+                # A rejected path is a client error, not a server fault: no traceback
+                logger.warning(f"Security validation failed while {action}: {e}", extra={"tool": fn.__name__})
+                return {
+                    "success": False,
+                    "error": f"Security validation failed: {e}"
+                }
+            except Exception as e:
+                # The tool name travels as a record attribute for structured handlers/formatters
+                logger.exception(f"Error {action}", extra={"tool": fn.__name__})
+                return {
+                    "success": False,
+                    "error": str(e)
+                }
+        return wrapper
+    return decorator
+
+
+def _require_project(project_id: str, user_id: str) -> Tuple[Optional[ProjectConfig], Optional[Dict[str, Any]]]:
+    """Look up a project, returning (project, None) or (None, error response)"""
+    project = project_manager.get_project(project_id, user_id)
+    if not project:
+        return None, {
+            "success": False,
+            "error": f"Project {project_id} not found for user {user_id}"
+        }
+    return project, None
+
+
+# One runner / BuildManager per project root, instead of re-resolving the root
+# and re-creating the build cache directory on every compile/test/deploy call.
+# Bounded so a long-lived server does not keep every project it has ever seen.
+@functools.lru_cache(maxsize=128)
+def _get_echidna_runner(project_path: str) -> EchidnaRunner:
+    return EchidnaRunner(project_path)
+
+
+@functools.lru_cache(maxsize=128)
+def _get_build_manager(project_path: str) -> BuildManager:
+    return BuildManager(project_path)
+
+
+# BuildConfig is frozen, so one instance per distinct set of project settings can be shared
+@functools.lru_cache(maxsize=128)
+def _build_config(
+    solc_version: str,
+    optimization_enabled: bool,
+    optimizer_runs: int,
+    evm_version: str
+) -> BuildConfig:
+    return BuildConfig(
+        toolchain=BuildToolchain.FOUNDRY,
+        solc_version=solc_version,
+        source_dir="src",
+        output_dir="out",
+        optimization_enabled=optimization_enabled,
+        optimizer_runs=optimizer_runs,
+        evm_version=evm_version
+    )
+
 
 ########################################################
 # MAIN TOOLS
@@ -26,7 +206,8 @@ project_manager = get_project_manager()
         "- Use this project_id for all subsequent operations."
     )
 )
-def project_create(
+@_tool_errors("creating project")
+async def project_create(
     user_id: str,
     project_type: str = "foundry",
     solc_version: str = "0.8.19",
@@ -35,33 +216,26 @@ def project_create(
     evm_version: str = "london"
 ) -> Dict[str, Any]:
     """Create a new temporary project with Foundry initialization for a specific user"""
-    try:
-        if project_type not in [t.value for t in ProjectType]:
-            return {
-                "success": False,
-                "error": f"Invalid project type: {project_type}. Valid types: {[t.value for t in ProjectType]}"
-            }
-        
-        project = project_manager.create_project(
-            user_id=user_id,
-            project_type=ProjectType(project_type),
-            solc_version=solc_version,
-            optimization_enabled=optimization_enabled,
-            optimizer_runs=optimizer_runs,
-            evm_version=evm_version
-        )
-        
-        return {
-            "success": True,
-            "project": project.to_dict()
-        }
-        
-    except Exception as e:
-        logger.error(f"Error creating project: {e}")
+    if project_type not in _PROJECT_TYPES:
         return {
             "success": False,
-            "error": str(e)
+            "error": f"Invalid project type: {project_type}. Valid types: {_PROJECT_TYPES_LIST}"
         }
+    
+    project = await _run_cpu(
+        project_manager.create_project,
+        user_id=user_id,
+        project_type=ProjectType(project_type),
+        solc_version=solc_version,
+        optimization_enabled=optimization_enabled,
+        optimizer_runs=optimizer_runs,
+        evm_version=evm_version
+    )
+    
+    return {
+        "success": True,
+        "project": project.to_dict()
+    }
 
 @mcp.tool(
     "project_list",
@@ -70,6 +244,8 @@ def project_create(
         "- If user_id is provided, returns only that user's projects.\n"
         "- If user_id is None, returns all projects from all users.\n"
         "- Use this to find existing project_ids before operations.\n"
+        "- Set brief=True to get only project_id, project_type and created_at per project "
+        "(use project_debug for the full configuration of a specific project).\n"
         "\n"
         "Foundry project structure:\n"
         "- src/ - contract source files (*.sol)\n"
@@ -79,21 +255,39 @@ def project_create(
         "- foundry.toml - project configuration"
     )
 )
-def project_list(user_id: str = None) -> Dict[str, Any]:
-    """List all available projects for a specific user, or all projects if user_id is None"""
+async def project_list(user_id: str = None, brief: bool = False) -> Dict[str, Any]:
+    """List all available projects for a specific user, or all projects if user_id is None
+    
+    Args:
+        user_id: The user ID, or None for all users
+        brief: Return only project_id, project_type and created_at for each project
+    """
     try:
         projects = project_manager.list_projects(user_id)
+        scope = f"for user {user_id}" if user_id else "for all users"
+        
+        if brief:
+            entries = [
+                {
+                    "project_id": project.project_id,
+                    "project_type": project.project_type.value,
+                    "created_at": project.created_at
+                }
+                for project in projects
+            ]
+        else:
+            entries = [project.to_dict() for project in projects]
         
         return {
             "success": True,
-            "projects": [project.to_dict() for project in projects],
+            "projects": entries,
             "count": len(projects),
             "user_id": user_id or "all",
-            "message": f"Found {len(projects)} projects" + (f" for user {user_id}" if user_id else " for all users")
+            "message": f"Found {len(projects)} projects {scope}"
         }
         
     except Exception as e:
-        logger.error(f"Error listing projects: {e}")
+        logger.exception("Error listing projects")
         return {
             "success": False,
             "error": str(e),
@@ -109,7 +303,7 @@ def project_list(user_id: str = None) -> Dict[str, Any]:
         "- If project not found, returns list of available project_ids."
     )
 )
-def project_debug(project_id: str, user_id: str) -> Dict[str, Any]:
+async def project_debug(project_id: str, user_id: str) -> Dict[str, Any]:
     """Debug project information and status"""
     try:
         project = project_manager.get_project(project_id, user_id)
@@ -126,22 +320,26 @@ def project_debug(project_id: str, user_id: str) -> Dict[str, Any]:
                 "message": f"Project {project_id} not found. Available projects: {available_ids}"
             }
         
-        project_path = Path(project.project_path)
-        directory_exists = project_path.exists()
+        project_path = project.project_path
+        directory_exists = True
         
-        directory_contents = []
-        if directory_exists:
-            try:
-                directory_contents = [item.name for item in project_path.iterdir()]
-            except Exception as e:
-                directory_contents = [f"Error reading directory: {e}"]
+        # scandir yields names straight from the directory read; a missing
+        # directory is detected by the same call instead of a separate exists()
+        try:
+            with os.scandir(project_path) as entries:
+                directory_contents = [entry.name for entry in entries]
+        except (FileNotFoundError, NotADirectoryError):
+            directory_exists = False
+            directory_contents = []
+        except Exception as e:
+            directory_contents = [f"Error reading directory: {e}"]
         
         return {
             "success": True,
             "project": project.to_dict(),
             "debug_info": {
                 "project_id": project.project_id,
-                "project_path": str(project_path),
+                "project_path": project_path,
                 "directory_exists": directory_exists,
                 "directory_contents": directory_contents,
                 "project_type": project.project_type.value,
@@ -151,7 +349,7 @@ def project_debug(project_id: str, user_id: str) -> Dict[str, Any]:
         }
         
     except Exception as e:
-        logger.error(f"Error debugging project {project_id}: {e}")
+        logger.exception(f"Error debugging project {project_id}")
         return {
             "success": False,
             "error": str(e),
@@ -168,7 +366,7 @@ def project_debug(project_id: str, user_id: str) -> Dict[str, Any]:
         "- Check directory_exists to verify the project directory exists."
     )
 )
-def project_get_path(project_id: str, user_id: str) -> Dict[str, Any]:
+async def project_get_path(project_id: str, user_id: str) -> Dict[str, Any]:
     """Get the absolute path to a project directory"""
     try:
         project = project_manager.get_project(project_id, user_id)
@@ -185,14 +383,15 @@ def project_get_path(project_id: str, user_id: str) -> Dict[str, Any]:
                 "message": f"Project {project_id} not found. Available projects: {available_ids}"
             }
         
-        project_path = Path(project.project_path)
-        directory_exists = project_path.exists()
+        project_path = project.project_path
+        # One stat that also checks the type: a stray file at the project path is not a project directory
+        directory_exists = os.path.isdir(project_path)
         
         return {
             "success": True,
             "project_id": project_id,
-            "project_path": str(project_path.absolute()),
-            "project_path_resolved": str(project_path.resolve()),
+            "project_path": os.path.abspath(project_path),
+            "project_path_resolved": str(project.resolved_path),
             "directory_exists": directory_exists,
             "project_type": project.project_type.value,
             "created_at": project.created_at,
@@ -200,7 +399,7 @@ def project_get_path(project_id: str, user_id: str) -> Dict[str, Any]:
         }
         
     except Exception as e:
-        logger.error(f"Error getting project path for {project_id}: {e}")
+        logger.exception(f"Error getting project path for {project_id}")
         return {
             "success": False,
             "error": str(e),
@@ -241,7 +440,8 @@ def project_get_path(project_id: str, user_id: str) -> Dict[str, Any]:
         "- allowFFI: allow HEVM ffi cheatcode (default: false)"
     )
 )
-def project_write_files(
+@_tool_errors("writing files")
+async def project_write_files(
     project_id: str,
     user_id: str,
     file_path: str = None,
@@ -259,34 +459,15 @@ def project_write_files(
     
     Note: Either provide (file_path, content) for a single file, or files dict for multiple files.
     """
-    try:
-        # Handle single file case
-        if file_path is not None and content is not None:
-            if files is not None:
-                return {
-                    "success": False,
-                    "error": "Cannot specify both single file (file_path/content) and multiple files (files) at the same time"
-                }
-            
-        result = project_manager._write_validated_file(
-            project_id, user_id, file_path, content, must_exist=False
-        )
-        
-        if result["success"]:
-            logger.info(f"Wrote file {file_path} in project {project_id}")
-            result["message"] = f"Successfully wrote {file_path}"
-        
-        return result
+    if files is not None:
+        if file_path is not None or content is not None:
+            return {
+                "success": False,
+                "error": "Cannot specify both single file (file_path/content) and multiple files (files) at the same time"
+            }
         
-        # Handle multiple files case
-        elif files is not None:
-            if file_path is not None or content is not None:
-        return {
-            "success": False,
-                    "error": "Cannot specify both single file (file_path/content) and multiple files (files) at the same time"
-                }
-            
-            result = project_manager.write_validated_files(project_id, files, user_id)
+        # All files go through one batched call instead of one write per file
+        result = await _run_io(project_manager.write_validated_files, project_id, files, user_id)
         
         return {
             "success": result["success"],
@@ -296,19 +477,23 @@ def project_write_files(
             "errors": result.get("errors"),
             "message": result.get("message", f"Added {result.get('count', 0)}/{result.get('total_files', 0)} files to project")
         }
+    
+    if file_path is not None and content is not None:
+        result = await _run_io(
+            project_manager._write_validated_file,
+            project_id, user_id, file_path, content, must_exist=False
+        )
         
-        else:
-            return {
-                "success": False,
-                "error": "Must provide either (file_path, content) for a single file or files dict for multiple files"
-            }
+        if result["success"]:
+            logger.info(f"Wrote file {file_path} in project {project_id}")
+            result["message"] = f"Successfully wrote {file_path}"
         
-    except Exception as e:
-        logger.error(f"Error writing files: {e}")
-        return {
-            "success": False,
-            "error": str(e)
-        }
+        return result
+    
+    return {
+        "success": False,
+        "error": "Must provide either (file_path, content) for a single file or files dict for multiple files"
+    }
 
 @mcp.tool(
     "project_delete_file",
@@ -319,7 +504,8 @@ def project_write_files(
         "- Use with caution: deleted files cannot be recovered."
     )
 )
-def project_delete_file(
+@_tool_errors("deleting file")
+async def project_delete_file(
     project_id: str,
     user_id: str,
     file_path: str,
@@ -333,65 +519,54 @@ def project_delete_file(
         file_path: Path to the file or directory to delete
         recursive: If True, recursively delete directories and their contents
     """
-    try:
-        project = project_manager.get_project(project_id, user_id)
-        if not project:
-            return {
-                "success": False,
-                "error": f"Project {project_id} not found"
-            }
+    project, error = _require_project(project_id, user_id)
+    if error:
+        return error
+    
+    not_found = {
+        "success": False,
+        "error": f"File {file_path} not found in project"
+    }
+    
+    def delete() -> Optional[Dict[str, Any]]:
+        """Validate, classify and remove the target; an error response, or None on success.
         
-        project_path = Path(project.project_path)
+        Runs on the I/O pool as one unit: path resolution, stat and unlink/rmtree
+        all touch the filesystem. A SecurityError is left to _tool_errors.
+        """
+        full_path = project_manager.validate_and_resolve_path(file_path, project.path)
         
-        # Security validation
+        # One stat classifies the target instead of exists() + is_dir() + unlink()'s own lookup
         try:
-            validated_path = project_manager.validate_and_resolve_path(file_path, project_path)
-        except SecurityError as e:
-            return {
-                "success": False,
-                "error": f"Security validation failed: {e}"
-            }
-        except Exception as e:
-            return {
-                "success": False,
-                "error": f"Path validation error: {e}"
-            }
-        
-        # Use validated path instead of full_path
-        full_path = validated_path
-        
-        if not full_path.exists():
-            return {
-                "success": False,
-                "error": f"File {file_path} not found in project"
-            }
+            st = os.stat(full_path)
+        except FileNotFoundError:
+            return not_found
         
-        if full_path.is_dir():
-            if recursive:
-                import shutil
-                shutil.rmtree(full_path)
-                logger.info(f"Recursively deleted directory {file_path} from project {project_id}")
-            else:
+        if stat.S_ISDIR(st.st_mode):
+            if not recursive:
                 return {
                     "success": False,
                     "error": f"Directory {file_path} cannot be deleted without recursive=True"
                 }
+            shutil.rmtree(full_path)
+            logger.info(f"Recursively deleted directory {file_path} from project {project_id}")
         else:
-            full_path.unlink()
+            try:
+                os.unlink(full_path)
+            except FileNotFoundError:
+                return not_found
             logger.info(f"Deleted file {file_path} from project {project_id}")
-        
-        return {
-            "success": True,
-            "file_path": file_path,
-            "message": f"Successfully deleted {file_path}"
-        }
-        
-    except Exception as e:
-        logger.error(f"Error deleting file: {e}")
-        return {
-            "success": False,
-            "error": str(e)
-        }
+        return None
+    
+    error = await _run_io(delete)
+    if error:
+        return error
+    
+    return {
+        "success": True,
+        "file_path": file_path,
+        "message": f"Successfully deleted {file_path}"
+    }
 
 @mcp.tool(
     "project_modify_file",
@@ -403,7 +578,8 @@ def project_delete_file(
         "- This is a full replacement, not a patch."
     )
 )
-def project_modify_file(
+@_tool_errors("modifying file")
+async def project_modify_file(
     project_id: str,
     user_id: str,
     file_path: str,
@@ -416,23 +592,48 @@ def project_modify_file(
     2. Modify content as needed
     3. Write new content with this function or project_write_files()
     """
-    try:
-        result = project_manager._write_validated_file(
-            project_id, user_id, file_path, new_content, must_exist=True
-        )
-        
-        if result["success"]:
-            logger.info(f"Modified file {file_path} in project {project_id}")
-            result["message"] = f"Successfully modified {file_path}"
-        
-        return result
-        
-    except Exception as e:
-        logger.error(f"Error modifying file: {e}")
+    result = await _run_io(
+        project_manager._write_validated_file,
+        project_id, user_id, file_path, new_content, must_exist=True
+    )
+    
+    if result["success"] and not result["changed"]:
+        result["message"] = f"{file_path} already has this content; file left unchanged"
+    elif result["success"]:
+        logger.info(f"Modified file {file_path} in project {project_id}")
+        result["message"] = f"Successfully modified {file_path}"
+    
+    return result
+
+@mcp.tool(
+    "project_modify_files",
+    description=(
+        "Replace the entire content of several existing files in one call.\n"
+        "- files: dict mapping file path (relative to project root) to its new full content.\n"
+        "- Every file must already exist; use project_write_files to create files.\n"
+        "- Prefer this over calling project_modify_file once per file."
+    )
+)
+@_tool_errors("modifying files")
+async def project_modify_files(
+    project_id: str,
+    user_id: str,
+    files: Dict[str, str]
+) -> Dict[str, Any]:
+    """Replace the content of multiple existing files
+    
+    Args:
+        project_id: The project ID
+        user_id: The user ID
+        files: Dictionary of file paths to their new content
+    """
+    if not files:
         return {
             "success": False,
-            "error": str(e)
+            "error": "No files provided"
         }
+    
+    return await _run_io(project_manager.write_validated_files, project_id, files, user_id, must_exist=True)
 
 @mcp.tool(
     "project_compile",
@@ -444,52 +645,34 @@ def project_modify_file(
         "or suggest a compatible pragma."
     )
 )
-def project_compile(project_id: str, user_id: str) -> Dict[str, Any]:
+@_tool_errors("compiling project")
+async def project_compile(project_id: str, user_id: str) -> Dict[str, Any]:
     """Compile project contracts"""
-    try:
-        from mcp_modules.build import BuildManager, BuildConfig, BuildToolchain
-        
-        project = project_manager.get_project(project_id, user_id)
-        if not project:
-            return {
-            "success": False,
-                "error": f"Project {project_id} not found for user {user_id}"
-            }
-        
-        project_path = Path(project.project_path)
-        build_manager = BuildManager(str(project_path))
-        
-        config = BuildConfig(
-            toolchain=BuildToolchain.FOUNDRY,
-            solc_version=project.solc_version,
-            source_dir="src",
-            output_dir="out",
-            optimization_enabled=project.optimization_enabled,
-            optimizer_runs=project.optimizer_runs,
-            evm_version=project.evm_version
-        )
-        
-        result = build_manager.compile(config)
-        
-        return {
+    project, error = _require_project(project_id, user_id)
+    if error:
+        return error
+    
+    config = _build_config(
+        project.solc_version,
+        project.optimization_enabled,
+        project.optimizer_runs,
+        project.evm_version
+    )
+    
+    result = await _compile(project, config)
+    
+    return {
+        "success": result.success,
+        "compilation_result": {
             "success": result.success,
-            "compilation_result": {
-                "success": result.success,
-                "artifacts": result.artifacts,
-                "compilation_time": result.compilation_time,
-                "errors": result.errors,
-                "warnings": result.warnings,
-                "project_type": project.project_type.value
-            },
-            "project_id": project_id
-        }
-        
-    except Exception as e:
-        logger.error(f"Error compiling project: {e}")
-        return {
-            "success": False,
-            "error": str(e)
-        }
+            "artifacts": result.artifacts,
+            "compilation_time": result.compilation_time,
+            "errors": result.errors,
+            "warnings": result.warnings,
+            "project_type": project.project_type.value
+        },
+        "project_id": project_id
+    }
 
 @mcp.tool(
     "project_run_tests",
@@ -497,64 +680,64 @@ def project_compile(project_id: str, user_id: str) -> Dict[str, Any]:
         "Run Foundry tests for a project.\n"
         "- Always compile the project first using project_compile.\n"
         "- Use pattern to filter tests by name (passed as -m pattern to forge test).\n"
+        "- Pass a list of patterns to run several test groups in one forge invocation "
+        "(joined into a single -m regex) instead of calling this tool once per group.\n"
         "- Use extra_args for advanced options like --ffi, -vvv, --match-contract, etc.\n"
+        "- Output is limited to tail_kb KiB per stream (head and tail kept); "
+        "set save_log=True to also get the full output in a log file (log_file).\n"
         "- Parse stdout/stderr to see test results and failures."
     )
 )
-def project_run_tests(
+@_tool_errors("running tests")
+async def project_run_tests(
     project_id: str,
     user_id: str,
-    pattern: str = None,
-    extra_args: List[str] = None
+    pattern: Union[str, List[str]] = None,
+    extra_args: List[str] = None,
+    tail_kb: int = MAX_OUTPUT_CHARS // 1024,
+    save_log: bool = False
 ) -> Dict[str, Any]:
     """Run tests for the project
     
     Args:
         project_id: The project ID
         user_id: The user ID
-        pattern: Test name pattern to filter (passed as `-m pattern` to forge test)
+        pattern: Test name pattern, or list of patterns, to filter (passed as `-m pattern` to forge test)
         extra_args: Extra CLI args to append (e.g., ["--ffi", "-vvv", "--match-contract", "MyTest"])
+        tail_kb: Output kept per stream, in KiB; longer output keeps its head and tail
+        save_log: Also write the complete output to a log file in the project
     
     Returns:
         Test results with stdout, stderr, duration, and success status
     """
-    try:
-        from mcp_modules.build import BuildManager
-        
-        project = project_manager.get_project(project_id, user_id)
-        if not project:
-            return {
-                "success": False,
-                "error": f"Project {project_id} not found for user {user_id}"
-            }
-        
-        project_path = Path(project.project_path)
-        build_manager = BuildManager(str(project_path))
-        
-        result = build_manager.run_tests(
+    project, error = _require_project(project_id, user_id)
+    if error:
+        return error
+    
+    build_manager = _get_build_manager(project.project_path)
+    
+    async with _forge_lock(project):
+        result = await _run_cpu(
+            build_manager.run_tests,
             pattern=pattern,
-            extra_args=extra_args
+            extra_args=extra_args,
+            max_chars=max(1, tail_kb) * 1024,
+            save_log=save_log,
         )
-        
-        return {
+    
+    return {
+        "success": result.success,
+        "test_result": {
             "success": result.success,
-            "test_result": {
-                "success": result.success,
-                "return_code": result.return_code,
-                "stdout": result.stdout,
-                "stderr": result.stderr,
-                "duration": result.duration
-            },
-            "project_id": project_id,
-            "message": "Tests completed successfully" if result.success else "Tests failed"
-        }
-        
-    except Exception as e:
-        logger.error(f"Error running tests: {e}")
-        return {
-            "success": False,
-            "error": str(e)
-        }
+            "return_code": result.return_code,
+            "stdout": result.stdout,
+            "stderr": result.stderr,
+            "duration": result.duration,
+            "log_file": result.log_file
+        },
+        "project_id": project_id,
+        "message": "Tests completed successfully" if result.success else "Tests failed"
+    }
 
 @mcp.tool(
     "project_run_echidna",
@@ -564,6 +747,8 @@ def project_run_tests(
         "- Command must be a full list: ['echidna', 'test/MyTest.sol', '--config', 'echidna.yaml', '--test-limit', '1000'].\n"
         "- Agent must construct the complete command including all flags.\n"
         "- Parse stdout/stderr to see fuzzing results and property violations.\n"
+        "- Output is limited to tail_kb KiB per stream (head and tail kept); "
+        "set save_log=True to also get the full output in a log file (log_file).\n"
         "\n"
         "Echidna configuration (echidna.yaml):\n"
         "- testMode: 'property' (user-defined properties), 'assertion' (assert failures), "
@@ -584,11 +769,14 @@ def project_run_tests(
         "Property functions must start with the prefix (default 'echidna_') and return bool."
     )
 )
-def project_run_echidna(
+@_tool_errors("running Echidna")
+async def project_run_echidna(
     project_id: str,
     user_id: str,
     command: List[str],
-    timeout: int = 300
+    timeout: int = 300,
+    tail_kb: int = MAX_OUTPUT_CHARS // 1024,
+    save_log: bool = False
 ) -> Dict[str, Any]:
     """Run Echidna fuzzing tests for the project.
     
@@ -597,6 +785,8 @@ def project_run_echidna(
         user_id: The user ID
         command: List of command arguments for echidna (e.g., ["echidna", "test/MyTest.sol", "--config", "echidna.yaml", "--test-limit", "1000"])
         timeout: Command timeout in seconds (default: 300)
+        tail_kb: Output kept per stream, in KiB; longer output keeps its head and tail
+        save_log: Also write the complete output to a log file in the project
     
     Note: Agent should construct the full command including:
     - Target test file path
@@ -604,30 +794,23 @@ def project_run_echidna(
     - Test parameters (--test-limit, --seed, etc.)
     - Output format (--format text/json)
     """
-    try:
-        project = project_manager.get_project(project_id, user_id)
-        if not project:
-            return {
-                "success": False,
-                "error": f"Project {project_id} not found for user {user_id}"
-            }
+    project, error = _require_project(project_id, user_id)
+    if error:
+        return error
 
-        runner = EchidnaRunner(project.project_path)
-        result = runner.run(command, timeout=timeout)
+    runner = _get_echidna_runner(project.project_path)
+    result = await _run_cpu(
+        runner.run, command, timeout=timeout, max_chars=max(1, tail_kb) * 1024, save_log=save_log
+    )
 
-        return {
-            "success": result["success"],
-            "return_code": result["return_code"],
-            "stdout": result["stdout"],
-            "stderr": result["stderr"],
-            "project_id": project_id,
-        }
-    except Exception as e:
-        logger.error(f"Error running Echidna for project {project_id}: {e}")
-        return {
-            "success": False,
-            "error": str(e)
-        }
+    return {
+        "success": result["success"],
+        "return_code": result["return_code"],
+        "stdout": result["stdout"],
+        "stderr": result["stderr"],
+        "log_file": result.get("log_file"),
+        "project_id": project_id,
+    }
 
 @mcp.tool(
     "project_cleanup_all",
@@ -638,23 +821,18 @@ def project_run_echidna(
         "- This permanently removes project directories and cannot be undone."
     )
 )
-def project_cleanup_all(user_id: str = None) -> Dict[str, Any]:
+@_tool_errors("cleaning up all projects")
+async def project_cleanup_all(user_id: str = None) -> Dict[str, Any]:
     """Clean up all projects for a specific user, or all projects if user_id is None"""
-    try:
-        project_manager.cleanup_all_projects(user_id)
-        
-        message = f"All projects cleaned up successfully" + (f" for user {user_id}" if user_id else " for all users")
-        return {
-            "success": True,
-            "message": message
-        }
-        
-    except Exception as e:
-        logger.error(f"Error cleaning up all projects: {e}")
-        return {
-            "success": False,
-            "error": str(e)
-        }
+    await _run_io(project_manager.cleanup_all_projects, user_id)
+    _get_echidna_runner.cache_clear()
+    _get_build_manager.cache_clear()
+    
+    scope = f"for user {user_id}" if user_id else "for all users"
+    return {
+        "success": True,
+        "message": f"All projects cleaned up successfully {scope}"
+    }
 
 @mcp.tool(
     "project_get_deployment_artifacts",
@@ -666,7 +844,8 @@ def project_cleanup_all(user_id: str = None) -> Dict[str, Any]:
         "then write it with project_write_deployment_script."
     )
 )
-def project_get_deployment_artifacts(
+@_tool_errors("getting deployment artifacts")
+async def project_get_deployment_artifacts(
     project_id: str,
     user_id: str
 ) -> Dict[str, Any]:
@@ -676,59 +855,40 @@ def project_get_deployment_artifacts(
     Agent should use this data to generate deployment script content,
     then use project_write_deployment_script() to write it.
     """
-    try:
-        from mcp_modules.build import BuildManager, BuildConfig, BuildToolchain
-        
-        project = project_manager.get_project(project_id, user_id)
-        if not project:
-            return {
-                "success": False,
-                "error": f"Project {project_id} not found for user {user_id}"
-            }
-        
-        project_path = Path(project.project_path)
-        build_manager = BuildManager(str(project_path))
-        
-        config = BuildConfig(
-            toolchain=BuildToolchain.FOUNDRY,
-            solc_version=project.solc_version,
-            source_dir="src",
-            output_dir="out",
-            optimization_enabled=project.optimization_enabled,
-            optimizer_runs=project.optimizer_runs,
-            evm_version=project.evm_version
-        )
-        
-        compile_result = build_manager.compile(config)
-        
-        if not compile_result.success:
-            return {
-            "success": False,
-                "error": "Project compilation failed",
-                "compilation_errors": compile_result.errors
-            }
-        
-        artifacts = compile_result.artifacts
-        if not artifacts:
-            return {
-                "success": False,
-                "error": "No artifacts found. Make sure the project has contracts and has been compiled successfully."
-            }
-        
+    project, error = _require_project(project_id, user_id)
+    if error:
+        return error
+    
+    config = _build_config(
+        project.solc_version,
+        project.optimization_enabled,
+        project.optimizer_runs,
+        project.evm_version
+    )
+    
+    compile_result = await _compile(project, config)
+    
+    if not compile_result.success:
         return {
-            "success": True,
-            "artifacts": artifacts,
-            "solc_version": project.solc_version,
-            "project_path": project.project_path,
-            "message": f"Found {len(artifacts)} contract artifacts"
+        "success": False,
+            "error": "Project compilation failed",
+            "compilation_errors": compile_result.errors
         }
-        
-    except Exception as e:
-        logger.error(f"Error getting deployment artifacts: {e}")
+    
+    artifacts = compile_result.artifacts
+    if not artifacts:
         return {
             "success": False,
-            "error": str(e)
+            "error": "No artifacts found. Make sure the project has contracts and has been compiled successfully."
         }
+    
+    return {
+        "success": True,
+        "artifacts": artifacts,
+        "solc_version": project.solc_version,
+        "project_path": project.project_path,
+        "message": f"Found {len(artifacts)} contract artifacts"
+    }
 
 @mcp.tool(
     "project_write_deployment_script",
@@ -739,7 +899,8 @@ def project_get_deployment_artifacts(
         "- Default path is 'script/Deploy.s.sol' but can be customized."
     )
 )
-def project_write_deployment_script(
+@_tool_errors("writing deployment script")
+async def project_write_deployment_script(
     project_id: str,
     user_id: str,
     script_content: str,
@@ -750,19 +911,12 @@ def project_write_deployment_script(
     Agent should generate the script content based on artifacts from
     project_get_deployment_artifacts(), then use this function to write it.
     """
-    try:
-        result = project_manager.write_deployment_script(
-            project_id, user_id, script_content, script_path
-        )
-        
-        return result
-        
-    except Exception as e:
-        logger.error(f"Error writing deployment script: {e}")
-        return {
-            "success": False,
-            "error": str(e)
-        }
+    result = await _run_io(
+        project_manager.write_deployment_script,
+        project_id, user_id, script_content, script_path
+    )
+    
+    return result
 
 @mcp.tool(
     "project_deploy",
@@ -771,10 +925,13 @@ def project_write_deployment_script(
         "- Requires a deployment script (use project_write_deployment_script first).\n"
         "- Default RPC is localhost:8545 (Anvil).\n"
         "- If broadcast=True, transactions are actually sent to the chain.\n"
+        "- timeout (seconds, default 300) kills a script that hangs, e.g. on an unreachable RPC; "
+        "output printed before the timeout is still returned.\n"
         "- Parse stdout/stderr to extract contract addresses and transaction hashes."
     )
 )
-def project_deploy(
+@_tool_errors("deploying project")
+async def project_deploy(
     project_id: str,
     user_id: str,
     script_path: str = None,
@@ -782,54 +939,45 @@ def project_deploy(
     private_key: str = None,
     broadcast: bool = True,
     transaction_type: str = "1559",
+    timeout: int = 300,
     **kwargs
 ) -> Dict[str, Any]:
     """Deploy project contracts using forge script
     
     Agent should parse stdout/stderr to extract contract addresses and transaction hashes.
     """
-    try:
-        from mcp_modules.build import BuildManager
-        
-        if transaction_type not in ["legacy", "1559"]:
-            return {
-                "success": False,
-                "error": "Transaction type must be 'legacy' or '1559'"
-            }
-        
-        project = project_manager.get_project(project_id, user_id)
-        if not project:
-            return {
-                "success": False,
-                "error": f"Project {project_id} not found for user {user_id}"
-            }
-        
-        if not script_path:
-            script_path = "script/Deploy.s.sol"
-        
-        build_manager = BuildManager(project.project_path)
-        result = build_manager.run_script(
+    if transaction_type not in _TX_TYPES:
+        return {
+            "success": False,
+            "error": "Transaction type must be 'legacy' or '1559'"
+        }
+    
+    project, error = _require_project(project_id, user_id)
+    if error:
+        return error
+    
+    if not script_path:
+        script_path = "script/Deploy.s.sol"
+    
+    build_manager = _get_build_manager(project.project_path)
+    async with _forge_lock(project):
+        result = await _run_cpu(
+            build_manager.run_script,
             script_path=script_path,
             rpc_url=rpc_url,
             private_key=private_key,
             broadcast=broadcast,
             transaction_type=transaction_type,
-            extra_args=kwargs.get("extra_args")
+            extra_args=kwargs.get("extra_args"),
+            timeout=timeout
         )
-        
-        return {
-            "success": result.success,
-            "deployment_result": result.to_dict(),
-            "project_id": project_id,
-            "message": "Deployment completed. Parse stdout/stderr to extract contract addresses and transaction hashes."
-        }
-        
-    except Exception as e:
-        logger.error(f"Error deploying project: {e}")
-        return {
-            "success": False,
-            "error": str(e)
-        }
+    
+    return {
+        "success": result.success,
+        "deployment_result": result.to_dict(),
+        "project_id": project_id,
+        "message": "Deployment completed. Parse stdout/stderr to extract contract addresses and transaction hashes."
+    }
 
 @mcp.tool(
     "project_install_dependency",
@@ -841,32 +989,38 @@ def project_deploy(
         "- Installs to lib/ directory using forge install."
     )
 )
-def project_install_dependency(
+@_tool_errors("installing dependency")
+async def project_install_dependency(
     project_id: str,
     user_id: str,
     dependency_url: str,
     branch: str = None
 ) -> Dict[str, Any]:
     """Install external dependency (e.g., OpenZeppelin) in Foundry project"""
-    try:
-        result = project_manager.install_dependency(project_id, dependency_url, user_id, branch)
-        
-        return {
-            "success": result["success"],
-            "project_id": project_id,
-            "dependency_url": dependency_url,
-            "branch": branch,
-            "message": result.get("message", "Dependency installation completed"),
-            "output": result.get("output", ""),
-            "error": result.get("error")
-        }
-        
-    except Exception as e:
-        logger.error(f"Error installing dependency: {e}")
-        return {
-            "success": False,
-            "error": str(e)
-        }
+    project, error = _require_project(project_id, user_id)
+    if error:
+        return error
+    
+    # forge install rewrites lib/, .gitmodules and foundry.toml: never alongside a build or test
+    async with _forge_lock(project), _install_slots:
+        result = await _run_io(
+            project_manager.install_dependency, project_id, dependency_url, user_id, branch
+        )
+    
+    # Output is already capped to its head and tail by the stream window in install_dependency
+    output = result.get("output", "")
+    return {
+        "success": result["success"],
+        "project_id": project_id,
+        "dependency_url": dependency_url,
+        "branch": branch,
+        "message": result.get("message", "Dependency installation completed"),
+        "output": output,
+        "output_chars": result.get("output_chars", len(output)),
+        "truncated": result.get("dropped_chars", 0) > 0,
+        "dropped_chars": result.get("dropped_chars", 0),
+        "error": result.get("error")
+    }
 
 @mcp.tool(
     "project_get_file_content",
@@ -874,13 +1028,18 @@ def project_install_dependency(
         "Read the content of any file from a project.\n"
         "- Use this to read contracts, tests, configs, or any project file.\n"
         "- Path is relative to project root (e.g., 'src/Contract.sol').\n"
-        "- Returns file content, metadata (size, timestamps), and absolute path."
+        "- Returns file content, metadata (size, timestamps), and absolute path.\n"
+        "- Files over 5 MB (e.g. .logs/ files) are returned in ranges: truncated=true and "
+        "next_offset is where to continue; pass offset/length to read a range "
+        "(negative offset counts from the end, e.g. -65536 for the last 64 KiB)."
     )
 )
-def project_get_file_content(
+async def project_get_file_content(
     project_id: str,
     user_id: str,
-    file_path: str
+    file_path: str,
+    offset: int = 0,
+    length: Optional[int] = None
 ) -> Dict[str, Any]:
     """Get content of any file from project directory
     
@@ -888,33 +1047,29 @@ def project_get_file_content(
         project_id: Project identifier
         user_id: User identifier
         file_path: Path to file relative to project root (e.g., "src/Contract.sol", "test/Test.t.sol", "foundry.toml")
+        offset: Byte offset to start at; negative counts from the end of the file
+        length: Maximum bytes to return (at most 5 MB per call)
     
     Returns:
         File content with metadata including size, timestamps, and absolute path
     """
     try:
-        result = project_manager.get_file_content(project_id, file_path, user_id)
+        result = await _run_io(
+            project_manager.get_file_content, project_id, file_path, user_id,
+            offset=offset, length=length
+        )
         
+        # The manager's result already has the response shape; annotate it in place
+        # rather than copying the (possibly large) content into a new dict
         if result["success"]:
-            return {
-                "success": True,
-                "project_id": project_id,
-                "file_path": result["file_path"],
-                "absolute_path": result["absolute_path"],
-                "content": result["content"],
-                "metadata": result["metadata"],
-                "message": f"Successfully read file {file_path}"
-            }
+            result["message"] = f"Successfully read file {file_path}"
         else:
-            return {
-                "success": False,
-                "error": result["error"],
-                "project_id": project_id,
-                "file_path": file_path
-            }
+            result["project_id"] = project_id
+            result["file_path"] = file_path
+        return result
         
     except Exception as e:
-        logger.error(f"Error getting file content: {e}")
+        logger.exception("Error getting file content")
         return {
             "success": False,
             "error": str(e),
@@ -922,6 +1077,39 @@ def project_get_file_content(
             "file_path": file_path
         }
 
+@mcp.tool(
+    "project_get_files_content",
+    description=(
+        "Read several files from a project in one call.\n"
+        "- file_paths: list of paths relative to the project root.\n"
+        "- Returns each file's content and metadata under files[path]; "
+        "files that cannot be read are listed in errors.\n"
+        "- Prefer this over calling project_get_file_content once per file."
+    )
+)
+async def project_get_files_content(
+    project_id: str,
+    user_id: str,
+    file_paths: List[str]
+) -> Dict[str, Any]:
+    """Get content of multiple files from project directory
+    
+    Args:
+        project_id: Project identifier
+        user_id: User identifier
+        file_paths: Paths to files relative to project root
+    """
+    try:
+        return await _run_io(project_manager.get_files_content, project_id, file_paths, user_id)
+    
+    except Exception as e:
+        logger.exception("Error getting files content")
+        return {
+            "success": False,
+            "error": str(e),
+            "project_id": project_id
+        }
+
 @mcp.tool(
     "project_list_files",
     description=(
@@ -929,14 +1117,18 @@ def project_get_file_content(
         "- If directory is None, lists root directory.\n"
         "- Use file_pattern to filter (e.g., '*.sol', '*.t.sol', '*.toml').\n"
         "- Returns files with metadata (size, timestamps) and subdirectories.\n"
+        "- Set columnar=True for large listings: files becomes {name: [...], path: [...], "
+        "size_bytes: [...], modified_at: [...], extension: [...]} and directories becomes "
+        "{name: [...], path: [...]}, with index i across the lists describing one entry.\n"
         "- Useful for exploring project structure."
     )
 )
-def project_list_files(
+async def project_list_files(
     project_id: str,
     user_id: str,
     directory: str = None,
-    file_pattern: str = None
+    file_pattern: str = None,
+    columnar: bool = False
 ) -> Dict[str, Any]:
     """List files in project directory
     
@@ -945,36 +1137,26 @@ def project_list_files(
         user_id: User identifier
         directory: Subdirectory to list (e.g., "src", "test", "script"). If None, lists root directory
         file_pattern: File pattern to filter (e.g., "*.sol", "*.t.sol", "*.toml"). If None, lists all files
+        columnar: Return one list per field instead of one dict per entry
     
     Returns:
         List of files and directories with metadata
     """
     try:
-        result = project_manager.list_project_files(project_id, user_id, directory, file_pattern)
+        result = await _run_io(
+            project_manager.list_project_files, project_id, user_id, directory, file_pattern, columnar
+        )
         
         if result["success"]:
-            return {
-                "success": True,
-                "project_id": project_id,
-                "directory": result["directory"],
-                "files": result["files"],
-                "directories": result["directories"],
-                "total_files": result["total_files"],
-                "total_directories": result["total_directories"],
-                "file_pattern": result["file_pattern"],
-                "message": f"Found {result['total_files']} files and {result['total_directories']} directories"
-            }
+            result["message"] = f"Found {result['total_files']} files and {result['total_directories']} directories"
         else:
-            return {
-                "success": False,
-                "error": result["error"],
-                "project_id": project_id,
-                "directory": directory,
-                "file_pattern": file_pattern
-            }
+            result["project_id"] = project_id
+            result["directory"] = directory
+            result["file_pattern"] = file_pattern
+        return result
         
     except Exception as e:
-        logger.error(f"Error listing project files: {e}")
+        logger.exception("Error listing project files")
         return {
             "success": False,
             "error": str(e),
@@ -990,4 +1172,13 @@ if __name__ == "__main__":
    #mcp.run(transport="stdio") 
    #mcp.run(transport="streamable-http") 
     mcp.settings.host = "0.0.0.0"
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        logger.info("Using uvloop event loop")
+    except ImportError:
+        pass
+    # FastMCP serves streamable-http through uvicorn, whose http="auto" picks the
+    # httptools parser when it is installed (optional extra). A single worker is
+    # deliberate: sessions and project state live in this process.
     mcp.run(transport="streamable-http")  
\ No newline at end of file